@@ -0,0 +1,86 @@
+# Compare the amount evaluator with the former `eval` based one:
+#   python benchmarks/amounts.py [--count 100000] [--distinct 2000]
+# Amounts are drawn from a pool of distinct values, like notes repeating the same
+# prices, and both evaluators must give the same results
+import argparse
+import math
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from money.helper.amount import parse_amount
+from money.helper.note import NoteHelper
+
+
+def eval_amount(input: str):
+    expression = input.replace("^", "**").replace(",", "")
+    if re.fullmatch(r"[\d\.\+\-*/%()]+", expression):
+        try:
+            return eval(expression)
+        except:
+            pass
+    raise ValueError(
+        f"Invalid 'amount' [{input}], expect a float or a math expression"
+    )
+
+
+def random_number() -> str:
+    number = random.choice([random.randint(1, 999), random.randint(1, 999) * 1000])
+    text = f"{number:,}" if random.random() < 0.5 else str(number)
+    return text + (f".{random.randint(0, 99)}" if random.random() < 0.2 else "")
+
+
+def random_amount() -> str:
+    choice = random.random()
+    if choice < 0.6:
+        return random_number()
+    if choice < 0.8:
+        return f"{random_number()}*{random.randint(2, 12)}"
+    if choice < 0.9:
+        return f"({random_number()}+{random_number()})/{random.randint(2, 5)}"
+    return f"{random.randint(1, 9)}^{random.randint(2, 6)}-{random_number()}"
+
+
+def measure(evaluate, amounts: list[str]) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [evaluate(amount) for amount in amounts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Amount evaluation benchmark")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--distinct", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    pool = [random_amount() for _ in range(args.distinct)]
+    amounts = [random.choice(pool) for _ in range(args.count)]
+
+    former, expected = measure(eval_amount, amounts)
+    current, results = measure(NoteHelper.eval_amount, amounts)
+    parse_amount.cache_clear()
+    uncached, _ = measure(NoteHelper.eval_amount, pool)
+
+    print(f"amounts                   {args.count:8d} ({args.distinct} distinct)")
+    print(f"eval                      {former * 1000:8.1f} ms")
+    print(f"evaluator                 {current * 1000:8.1f} ms")
+    print(f"evaluator, distinct only  {uncached * 1000:8.1f} ms")
+
+    mismatches = [
+        amount
+        for amount, value, result in zip(amounts, expected, results)
+        if not math.isclose(value, result, rel_tol=1e-12)
+    ]
+    if mismatches:
+        print(f"FAILED: different results for {sorted(set(mismatches))[:10]}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
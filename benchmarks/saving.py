@@ -0,0 +1,90 @@
+# Measure AppHelper.save_transactions_in_scope with one transaction per note and
+# with chunks of notes in one transaction:
+#   python benchmarks/saving.py [--count 20000] [--chunks 1 100 500] [--scope sharing]
+# Every run saves the same notes into a new database file, all of them must be
+# saved
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from money.constants.schema import *
+from money.constants.var import SCOPE_SHARING, SCOPE_TX
+from money.helper.app import AppHelper
+from money.main import prepare_database
+
+
+def random_data(scope: str) -> dict:
+    minutes = random.randint(0, 100000)
+    data = {
+        SCOPE_TX: dict(
+            amount=random.randint(1, 500) * 1000.0,
+            currency="VND",
+            message=random.choice(["lunch", "taxi", "rent", "coffee"]),
+            payer=random.randint(1, 2),
+            timestamp=datetime(2024, 1, 1) + timedelta(minutes=minutes),
+        )
+    }
+    if scope == SCOPE_SHARING:
+        people = random.sample([1, 2, 3], random.randint(1, 3))
+        data[SCOPE_SHARING] = dict(people=people, shares=[1.0] * len(people))
+    return data
+
+
+def create_names(database):
+    for name in ["me", "An", "Bình"]:
+        database[TABLE_ACCOUNT.name].insert(dict(name=name))
+    for name in ["cash", "Momo"]:
+        database[TABLE_WALLET.name].insert(dict(name=name, account=1))
+
+
+def measure(directory: str, data: list[dict], chunk_size: int) -> tuple:
+    path = os.path.join(directory, f"money-{chunk_size}.db")
+    database, good = prepare_database(path)
+    if not good:
+        sys.exit(f"FAILED: cannot prepare the database {database.get_errors()}")
+    create_names(database)
+    app = SimpleNamespace(database=database)
+    # the items get the ids of their rows, every run saves fresh copies
+    data = [{scope: dict(item) for scope, item in note.items()} for note in data]
+    start = time.perf_counter()
+    error_indices = AppHelper.save_transactions_in_scope(app, data, chunk_size)
+    duration = time.perf_counter() - start
+    count = database.query(f"SELECT count(*) AS count FROM {TABLE_TRANSACTION.name}")
+    return duration, count[0]["count"], len(error_indices)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transaction saving benchmark")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[1, 100, 500])
+    parser.add_argument("--scope", choices=[SCOPE_TX, SCOPE_SHARING])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    data = [random_data(args.scope) for _ in range(args.count)]
+    failed = False
+    print(f"notes {args.count} ({args.scope or SCOPE_TX})")
+    with tempfile.TemporaryDirectory() as directory:
+        for chunk_size in args.chunks:
+            duration, saved, errors = measure(directory, data, chunk_size)
+            print(
+                f"chunk {chunk_size:6d} {duration * 1000:10.1f} ms"
+                f" {args.count / duration:10.0f} notes/s {saved} saved"
+            )
+            failed = failed or saved != args.count or errors > 0
+
+    if failed:
+        print("FAILED: some notes were not saved")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Measure the cold start of the application in fresh interpreters:
+#   python benchmarks/startup.py [--runs 10] [--limit 0.5]
+# It fails when a heavy note parsing library is loaded on start, or when importing
+# the commands takes longer than the limit (in seconds, over a bare interpreter)
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["bs4", "requests", "argon2", "Crypto", "yaml"]
+
+IMPORT_CODE = "import money.prototype"
+LOADED_CODE = (
+    "import sys, money.prototype; "
+    + f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+PREPARE_CODE = "from money.main import prepare_database; prepare_database({path!r})"
+
+
+def run(code: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - start, result.stdout.strip()
+
+
+def median_time(code: str, runs: int) -> float:
+    return statistics.median([run(code)[0] for _ in range(runs)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--limit", type=float, default=0.5)
+    args = parser.parse_args()
+
+    _, loaded = run(LOADED_CODE)
+    interpreter = median_time("pass", args.runs)
+    commands = median_time(IMPORT_CODE, args.runs) - interpreter
+    with tempfile.TemporaryDirectory() as directory:
+        code = PREPARE_CODE.format(path=os.path.join(directory, "money.db"))
+        first_prepare = run(code)[0] - interpreter
+        next_prepare = median_time(code, args.runs) - interpreter
+
+    print(f"interpreter               {interpreter * 1000:8.1f} ms")
+    print(f"import commands           {commands * 1000:8.1f} ms")
+    print(f"prepare new database      {first_prepare * 1000:8.1f} ms")
+    print(f"prepare prepared database {next_prepare * 1000:8.1f} ms")
+
+    failures = []
+    if loaded:
+        failures.append(f"heavy modules are loaded on start: {loaded}")
+    if commands > args.limit:
+        failures.append(f"importing commands takes more than {args.limit}s")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Compare the streaming table extractor with the BeautifulSoup parsing on the
+# same Notesnook page:
+#   python benchmarks/tables.py [--rows 20000] [--tables 4] [--runs 3]
+# The page has tables with header cells, formatted cells and empty rows, both
+# parsers must give the same rows. BeautifulSoup (bs4) has to be installed
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from money.notes import NotesnookParser
+from money.notes.table import iterate_tables
+
+HEADERS = ["amount", "message", "payer", "category", "timestamp"]
+
+
+def random_cells() -> list[str]:
+    return [
+        random.choice(["25,000", "<b>120</b>000", "15000*3", "1.5"]),
+        random.choice(["lunch", "<p>taxi</p><p>to airport</p>", "rent &amp; bills"]),
+        random.choice(["cash", "<span>Momo</span>", ""]),
+        random.choice(["food", "Ăn uống", "travel"]),
+        f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+    ]
+
+
+def make_page(rows: int, tables: int) -> str:
+    parts = ['<html><head><meta charset="utf-8"></head><body>']
+    for table in range(tables):
+        parts.append(f"<h2>Expenses {table + 1}</h2><p>some text</p><table><tbody>")
+        parts.append("<tr>" + "".join(f"<th>{h}</th>" for h in HEADERS) + "</tr>")
+        for index in range(rows // tables):
+            if index % 100 == 99:
+                parts.append("<tr><td></td><td> </td></tr>")
+            cells = "".join(f"<td>{cell}</td>" for cell in random_cells())
+            parts.append(f"<tr>{cells}</tr>")
+        parts.append("</tbody></table>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def measure(parse, text: str, runs: int) -> tuple[float, int, list]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = parse(text)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notesnook table parsing benchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    text = make_page(args.rows, args.tables)
+    ways = [
+        ("bs4", NotesnookParser.parse_soup),
+        ("stream", lambda text: list(iterate_tables(text))),
+    ]
+    results = {}
+    print(f"page {len(text) / 1024 / 1024:.1f} MB, {args.rows} rows")
+    for name, parse in ways:
+        duration, peak, results[name] = measure(parse, text, args.runs)
+        print(
+            f"{name:8s} {duration * 1000:10.1f} ms {peak / 1024 / 1024:8.1f} MB peak"
+            f" {len(results[name])} rows"
+        )
+
+    same = results["stream"] == results["bs4"]
+    if not same:
+        print("FAILED: the rows are different")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Compare the ways of parsing a local CSV file for an import:
+#   python benchmarks/workers.py [--count 200000] [--workers 4] [--chunk 500]
+# - here: the notes are read, hashed and parsed by this process
+# - chunks: the notes are read and hashed here, chunks are parsed by the workers
+# - ranges: the workers read, hash and parse byte ranges of the file
+# The wall time and the CPU time of this process are shown, a gain needs more than
+# one core. Every way must give the same data and errors
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from money.constants.schema import *
+from money.helper.alias import AliasMap
+from money.helper.note import NoteHelper
+from money.main import prepare_database
+from money.notes import LocalParser
+
+ACCOUNTS = ["me", "An", "Bình"]
+WALLETS = ["cash", "Vietcombank", "Momo"]
+TAGS = ["food", "Ăn uống", "travel"]
+
+
+def random_note() -> dict:
+    return {
+        "amount": random.choice(["25,000", "120000", "15000*3", "abc"]),
+        "currency": "VND",
+        "message": random.choice(["lunch", "taxi", "rent", "coffee"]),
+        "payer": random.choice(WALLETS + ["CASH", "unknown"]),
+        "category": random.choice(TAGS + ["an uong", ""]),
+        "timestamp": f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+    }
+
+
+def write_notes(path: str, count: int):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(random_note()))
+        writer.writeheader()
+        for _ in range(count):
+            writer.writerow(random_note())
+
+
+def create_names(database):
+    for name in ACCOUNTS:
+        database[TABLE_ACCOUNT.name].insert(dict(name=name))
+    for name in WALLETS:
+        database[TABLE_WALLET.name].insert(dict(name=name, account=1))
+    for name in TAGS:
+        database[TABLE_TAG.name].insert(dict(name=name))
+
+
+def read_chunks(path: str, chunk_size: int):
+    notes = LocalParser.iterate(path, position={})
+    for start, chunk in NoteHelper.chunk_notes(notes, chunk_size):
+        # an import hashes every read note to find the new ones
+        for note in chunk:
+            NoteHelper.digest_note(note)
+        yield start, chunk, None
+
+
+def parse_chunks(aliases, path: str, args, workers: int):
+    result, errors = [], []
+    chunks = NoteHelper.parse_chunks(
+        aliases, read_chunks(path, args.chunk), workers=workers, options=dict(scale=1)
+    )
+    for _, _, _, data, error_with_indices in chunks:
+        result.extend(data)
+        errors.extend(index for index, _ in error_with_indices)
+    return result, errors
+
+
+def parse_ranges(aliases, path: str, args, workers: int):
+    result, errors, read_count = [], [], 0
+    ranges = NoteHelper.parse_ranges(
+        aliases, path, workers=workers, options=dict(scale=1)
+    )
+    for parsed in ranges:
+        result.extend(data for _, data in parsed["data"])
+        errors.extend(read_count + index for index, _, _ in parsed["errors"])
+        read_count += parsed["count"]
+    return result, errors
+
+
+def measure(parse, database, path: str, args, workers: int):
+    aliases = AliasMap(
+        database, [TABLE_ACCOUNT.name, TABLE_TAG.name, TABLE_WALLET.name]
+    )
+    start, start_cpu = time.perf_counter(), time.process_time()
+    result = parse(aliases, path, args, workers)
+    return time.perf_counter() - start, time.process_time() - start_cpu, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel note parsing benchmark")
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        database, good = prepare_database(os.path.join(directory, "money.db"))
+        if not good:
+            sys.exit(f"FAILED: cannot prepare the database {database.get_errors()}")
+        create_names(database)
+        path = os.path.join(directory, "notes.csv")
+        write_notes(path, args.count)
+
+        ways = [
+            ("here", parse_ranges, 0),
+            ("chunks", parse_chunks, args.workers),
+            ("ranges", parse_ranges, args.workers),
+        ]
+        results = {}
+        print(f"notes {args.count}, workers {args.workers}, cores {os.cpu_count()}")
+        for name, parse, workers in ways:
+            wall, cpu, results[name] = measure(parse, database, path, args, workers)
+            print(f"{name:8s} {wall * 1000:10.1f} ms wall {cpu * 1000:10.1f} ms cpu")
+
+    expected = results["here"]
+    failed = [name for name, result in results.items() if result != expected]
+    if failed:
+        print(f"FAILED: different data or errors with {', '.join(failed)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Send a command to the resident app and print its output:
+#   python -m money.client report --currencies VND
+# The app is started with `python -m money.main serve`
+import os
+import shlex
+import socket
+import sys
+
+from .constants.var import ENV_SOCKET_PATH, DEFAULT_SOCKET_PATH
+
+SOCKET_PATH = os.environ.get(ENV_SOCKET_PATH, DEFAULT_SOCKET_PATH)
+READ_SIZE = 64 * 1024
+
+
+def send_command(line: str, path: str = SOCKET_PATH, output=None):
+    output = output or sys.stdout.buffer
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(line.encode("utf-8") + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        while data := client.recv(READ_SIZE):
+            output.write(data)
+            output.flush()
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m money.client <command> [arguments]")
+    try:
+        send_command(shlex.join(sys.argv[1:]))
+    except OSError as error:
+        sys.exit(
+            f"Cannot connect to [{os.path.abspath(SOCKET_PATH)}]: {error}\n"
+            + "Start the app with `python -m money.main serve`"
+        )
+
+
+if __name__ == "__main__":
+    main()
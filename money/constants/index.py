@@ -0,0 +1,29 @@
+from cmdapp.parser import COLUMN_DELETE
+
+from .schema import *
+
+ACTIVE_RECORDS = f"{COLUMN_DELETE} IS NULL"
+
+# indexes are created on every table definition from `DATABASE_SCHEMA`,
+# `where` makes a partial index that only covers the matched records
+DATABASE_INDEXES = [
+    dict(table=TABLE_TRANSACTION, columns=["timestamp", "id"], where=ACTIVE_RECORDS),
+    dict(
+        table=TABLE_TRANSACTION,
+        columns=["payer", "currency", "timestamp"],
+        where=ACTIVE_RECORDS,
+    ),
+    dict(
+        table=TABLE_TRANSACTION,
+        columns=["receiver", "currency", "timestamp"],
+        where=ACTIVE_RECORDS,
+    ),
+    dict(table=TABLE_TRANSACTION, columns=["category"], where=ACTIVE_RECORDS),
+    dict(table=TABLE_SHARING, columns=["tag"]),
+    dict(table=TABLE_LIQUIDITY, columns=["wallet", "currency", "created_at"]),
+    dict(
+        table=TABLE_LIQUIDITY,
+        columns=["wallet", "currency", "timestamp"],
+        where=ACTIVE_RECORDS,
+    ),
+]
@@ -36,6 +36,19 @@ TABLE_LIQUIDITY = TableMeta(
     meta_columns=["created_at", "deleted_at"],
 )
 
+TABLE_BALANCE = TableMeta(
+    name="balance",
+    columns={
+        "wallet": "[wallet_id] (*int): wallet",
+        "currency": "(*str): currency unit",
+        "day": "(*str): day (YYYY-MM-DD) of the summarized transactions",
+        "delta": "(*float): total received minus total paid by the wallet in the day",
+        "count": "(*int): number of transactions summarized in the day",
+    },
+    meta_columns=[],
+    constraints=["UNIQUE(wallet, currency, day)"],
+)
+
 TABLE_TAG = TableMeta(
     name="tag",
     columns={
@@ -109,7 +122,7 @@ TABLE_REPORT = TableMeta(
     columns={
         "name": "n (*str[telex]): name for reference",
         "filters": "(json): filters apply on transactions",
-        "txs": "[transaction_ids] (*array[int]): transactions belongs to this report",
+        "txs": "[transaction_ids] (*str): transactions belongs to this report, as sorted id ranges like `1-20,25`",
         "data": "(json): report data",
     },
     meta_columns=["created_at", "deleted_at"],
@@ -125,15 +138,30 @@ TABLE_NOTE_RESOURCE = TableMeta(
         "scope": f"t, type (str: {json.dumps(IMPORT_SCOPES)} = tx): what data is inside each note: pure transaction, sharing or order",
         "last_import": "(datetime): last imported timestamp",
         "last_record": "(json): last record from last importing, used to find new notes for next importing",
+        "last_offset": "(int): byte offset in the local file after the last read note, used to read only appended notes for next importing",
+        "last_size": "(int): size (in bytes) of the local file on last importing",
+        "fingerprint": "(str): hash of the head of the local file, used to detect a rewritten file",
     },
     meta_columns=["created_at", "updated_at", "deleted_at"],
     constraints=["UNIQUE(name)"],
 )
 
+TABLE_NOTE_HASH = TableMeta(
+    name="note_hash",
+    plural="note_hashes",
+    columns={
+        "resource": "[resource_id] (*int): resource that the note is imported from",
+        "hash": "(*str): content hash of the imported note",
+    },
+    meta_columns=["created_at"],
+    constraints=["UNIQUE(resource, hash)"],
+)
+
 TABLE_LISTS = [
     TABLE_ACCOUNT,
     TABLE_WALLET,
     TABLE_LIQUIDITY,
+    TABLE_BALANCE,
     TABLE_TAG,
     TABLE_TRANSACTION,
     TABLE_REPORT,
@@ -141,4 +169,5 @@ TABLE_LISTS = [
     TABLE_SHARING,
     TABLE_EVENT,
     TABLE_NOTE_RESOURCE,
+    TABLE_NOTE_HASH,
 ]
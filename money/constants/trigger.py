@@ -0,0 +1,53 @@
+from cmdapp.parser import COLUMN_DELETE
+
+from .schema import *
+
+LEDGER_COLUMNS = ["wallet", "currency", "day", "delta", "count"]
+
+
+# add (sign = 1) or remove (sign = -1) one side of the `row` transaction
+# from the daily balance of its wallet
+def ledger_upsert(row: str, wallet_column: str, sign: int) -> str:
+    received = sign if wallet_column == "receiver" else -sign
+    delta = f"{row}.amount" if received > 0 else f"-{row}.amount"
+    return f"""
+    INSERT INTO {TABLE_BALANCE.name} ({', '.join(LEDGER_COLUMNS)})
+    SELECT {row}.{wallet_column}, {row}.currency, date({row}.timestamp), {delta}, {sign}
+    WHERE {row}.{wallet_column} IS NOT NULL
+        AND {row}.timestamp IS NOT NULL
+        AND {row}.{COLUMN_DELETE} IS NULL
+    ON CONFLICT (wallet, currency, day)
+    DO UPDATE SET delta = delta + excluded.delta, count = count + excluded.count
+    """
+
+
+def ledger_statements(row: str, sign: int) -> list[str]:
+    return [
+        ledger_upsert(row, "receiver", sign),
+        ledger_upsert(row, "payer", sign),
+    ]
+
+
+# triggers keep `TABLE_BALANCE` in sync with every write on the transactions,
+# including the generic database commands
+DATABASE_TRIGGERS = [
+    dict(
+        name="tx_balance_insert",
+        table=TABLE_TRANSACTION,
+        event="AFTER INSERT",
+        statements=ledger_statements("NEW", 1),
+    ),
+    dict(
+        name="tx_balance_update",
+        table=TABLE_TRANSACTION,
+        event="AFTER UPDATE OF "
+        + f"amount, currency, payer, receiver, timestamp, {COLUMN_DELETE}",
+        statements=ledger_statements("OLD", -1) + ledger_statements("NEW", 1),
+    ),
+    dict(
+        name="tx_balance_delete",
+        table=TABLE_TRANSACTION,
+        event="AFTER DELETE",
+        statements=ledger_statements("OLD", -1),
+    ),
+]
@@ -3,6 +3,10 @@ SCOPE_ORDER = "order"
 SCOPE_SHARING = "sharing"
 IMPORT_SCOPES = [SCOPE_TX, SCOPE_ORDER, SCOPE_SHARING]
 
+MONOGRAPH_URL = "https://monogr.ph/"
+# resource format to read a remote link as a Notesnook monograph
+NOTESNOOK_FORMAT = "notesnook"
+
 SHARE_NOTE_PATTERN = r"(\w+)\s*(?:[:=]([\d\.]+))?"
 
 CONVERSION_RATE_PATTERN = r"^\s*(\w+)\s*[=:]\s*([\d\.]+)\s*$"
@@ -20,6 +24,22 @@ BILL_TRANSFER_AMOUNT = "amount"
 
 ANONYMOUS_NAME = "???"
 
+# id lists longer than this are bound as one JSON parameter and joined with
+# `json_each` instead of being written inline into the SQL
+INLINE_IDS_LIMIT = 500
+
+# export formats written row by row while reading the database, other formats
+# (html included) are rendered by the response formatter from the whole result,
+# so their output stays the one of the formatter
+EXPORT_STREAM_FORMATS = ["csv", "jsonl"]
+EXPORT_PAGE_SIZE = 1000
+
+# bytes of a local file read and parsed at once by a process of a parallel import
+WORKER_RANGE_SIZE = 1024 * 1024
+
+# a watched file that keeps changing is imported at least this often (in seconds)
+WATCH_MAX_DELAY = 60
+
 REPORT_IN = "in"
 REPORT_OUT = "out"
 
@@ -29,3 +49,10 @@ CONFIG_EVENT_FIELDNAMES = "EVENT"
 
 ENV_DATABASE_PATH = "MONEY_DATABASE_PATH"
 ENV_CONFIG_PATH = "MONEY_CONFIG_PATH"
+# unix socket where the resident app (`python -m money.main serve`) listens
+ENV_SOCKET_PATH = "MONEY_SOCKET_PATH"
+DEFAULT_SOCKET_PATH = "money.sock"
+# file to keep derived keys for Notesnook decryption between runs
+ENV_KEY_CACHE_PATH = "MONEY_KEY_CACHE_PATH"
+# folder to keep fetched monograph pages for conditional requests
+ENV_PAGE_CACHE_PATH = "MONEY_PAGE_CACHE_PATH"
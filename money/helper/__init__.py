@@ -2,3 +2,7 @@ from .app import AppHelper
 from .note import NoteHelper
 from .event import EventHelper
 from .report import ReportHelper
+from .schema import SchemaHelper
+from .balance import BalanceHelper
+from .export import ExportHelper
+from .alias import AliasMap
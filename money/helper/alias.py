@@ -0,0 +1,145 @@
+import unicodedata
+
+from cmdapp.database import Database
+from cmdapp.parser import COLUMN_ID, COLUMN_DELETE, TableMeta
+
+# names typed in telex are converted like the telex columns of the tables
+TELEX_NAME = TableMeta(name="alias", columns={"name": "(str[telex]): typed name"})
+
+
+class AliasMap:
+    # names and ids of the tables are read once, then every note is resolved in
+    # memory. Names also match regardless of spaces, case and Vietnamese accents
+    # when only one record has the folded name. Unknown names are left out of
+    # the notes, unless `strict` makes them fail
+    def __init__(
+        self, database: Database, table_names: list[str], strict: bool = False
+    ):
+        self.strict = strict
+        self.ids: dict[str, set[int]] = {}
+        self.names: dict[str, list[dict[str, int]]] = {}
+        self.unknown: dict[str, dict[str, int]] = {}
+        for table_name in table_names:
+            records = database.query(
+                f"SELECT {COLUMN_ID}, name FROM {table_name} "
+                + f"WHERE {COLUMN_DELETE} IS NULL"
+            )
+            self.add(table_name, records or [])
+
+    @staticmethod
+    def normalize(name) -> str:
+        return " ".join(str(name).split())
+
+    @staticmethod
+    def fold_case(name) -> str:
+        return AliasMap.normalize(name).casefold()
+
+    @staticmethod
+    def fold_accents(name) -> str:
+        text = unicodedata.normalize("NFD", AliasMap.fold_case(name))
+        text = "".join(char for char in text if not unicodedata.combining(char))
+        return text.replace("đ", "d")
+
+    @staticmethod
+    def from_telex(name) -> str:
+        return TELEX_NAME.sanitize_data({"name": name}).get("name") or ""
+
+    # looser keys are tried after the stricter ones
+    KEYS = [normalize, fold_case, fold_accents]
+
+    def add(self, table_name: str, records: list[dict]):
+        ids = self.ids.setdefault(table_name, set())
+        names = self.names.setdefault(table_name, [{} for _ in AliasMap.KEYS])
+        self.unknown.setdefault(table_name, {})
+        for record in records:
+            ids.add(record[COLUMN_ID])
+            for get_key, keys in zip(AliasMap.KEYS, names):
+                key, record_id = get_key(record["name"]), record[COLUMN_ID]
+                # ambiguous keys never match
+                if keys.get(key, record_id) != record_id:
+                    record_id = None
+                keys[key] = record_id
+
+    def find(self, table_name: str, value) -> int:
+        if isinstance(value, int):
+            return value if value in self.ids[table_name] else None
+        name = AliasMap.normalize(value)
+        if name not in self.names[table_name][0] and name.isdigit():
+            return self.find(table_name, int(name))
+        record_id = self.find_name(table_name, name)
+        if record_id is None:
+            telex_name = AliasMap.normalize(AliasMap.from_telex(name))
+            if telex_name != name:
+                record_id = self.find_name(table_name, telex_name)
+        return record_id
+
+    def find_name(self, table_name: str, name: str) -> int:
+        for get_key, keys in zip(AliasMap.KEYS, self.names[table_name]):
+            record_id = keys.get(get_key(name))
+            if record_id is not None:
+                return record_id
+        return None
+
+    # resolve a name, an id or a list of them into ids
+    def lookup(self, table_name: str, value):
+        if isinstance(value, (list, tuple)):
+            ids = [self.find(table_name, item) for item in value]
+            unknown = [item for item, id in zip(value, ids) if id is None]
+        else:
+            if value is None or value == "":
+                return None
+            ids = self.find(table_name, value)
+            unknown = [value] if ids is None else []
+        if unknown:
+            raise UnknownAliasError(table_name, unknown, ids)
+        return ids
+
+    # unknown names are counted to be reported at once after the import
+    def count_unknown(self, error: "UnknownAliasError"):
+        counter = self.unknown[error.table_name]
+        for name in error.names:
+            counter[str(name)] = counter.get(str(name), 0) + 1
+
+    # parallel imports count the unknown names of each chunk in their own process
+    def take_unknown(self) -> dict[str, dict[str, int]]:
+        unknown = self.unknown
+        self.unknown = {table_name: {} for table_name in unknown}
+        return unknown
+
+    def add_unknown(self, unknown: dict[str, dict[str, int]]):
+        for table_name, names in unknown.items():
+            counter = self.unknown[table_name]
+            for name, count in names.items():
+                counter[name] = counter.get(name, 0) + count
+
+    # the ids found, None at the positions of the unknown names
+    def handle_unknown(self, error: "UnknownAliasError"):
+        self.count_unknown(error)
+        if self.strict:
+            raise error
+        return error.ids
+
+    # a list keeps its positions, for the values paired with each name
+    def resolve_aligned(self, table_name: str, value):
+        try:
+            return self.lookup(table_name, value)
+        except UnknownAliasError as error:
+            return self.handle_unknown(error)
+
+    # unknown names are left out of the ids
+    def resolve(self, table_name: str, value):
+        ids = self.resolve_aligned(table_name, value)
+        if isinstance(ids, list):
+            return [id for id in ids if id is not None]
+        return ids
+
+
+class UnknownAliasError(ValueError):
+    def __init__(self, table_name: str, names: list, ids=None):
+        super().__init__(f"Unknown {table_name} [{', '.join(map(str, names))}]")
+        self.table_name = table_name
+        self.names = names
+        self.ids = ids
+
+    def __reduce__(self):
+        return UnknownAliasError, (self.table_name, self.names, self.ids)
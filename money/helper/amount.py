@@ -0,0 +1,150 @@
+import re
+from functools import lru_cache
+
+AMOUNT_CACHE_SIZE = 4096
+PLAIN_AMOUNT_PATTERN = re.compile(r"\d[\d,]*|\d[\d,]*\.\d*|\.\d+")
+AMOUNT_TOKEN_PATTERN = re.compile(
+    r"(?P<number>\d[\d,]*(?:\.\d*)?|\.\d+)"
+    + r"|(?P<operator>\*\*|//|[-+*/%^()])"
+    + r"|(?P<space>\s+)"
+)
+# larger integer powers are computed as floats, so they overflow instead of hanging
+MAX_INT_EXPONENT = 64
+
+
+class AmountError(ValueError):
+    def __init__(self, message: str, position: int):
+        super().__init__(message)
+        self.message = message
+        self.position = position
+
+    def __reduce__(self):
+        return AmountError, (self.message, self.position)
+
+
+def to_number(text: str):
+    text = text.replace(",", "")
+    return float(text) if "." in text else int(text)
+
+
+def tokenize_amount(expression: str) -> list[tuple[str, str, int]]:
+    tokens, position = [], 0
+    while position < len(expression):
+        match = AMOUNT_TOKEN_PATTERN.match(expression, position)
+        if not match:
+            raise AmountError(f"unexpected '{expression[position]}'", position)
+        if match.lastgroup != "space":
+            token = match.group()
+            tokens.append((match.lastgroup, "**" if token == "^" else token, position))
+        position = match.end()
+    tokens.append(("end", "", len(expression)))
+    return tokens
+
+
+# recursive descent parser with the precedence of python:
+#   expression = term (("+" | "-") term)*
+#   term = factor (("*" | "/" | "//" | "%") factor)*
+#   factor = ("+" | "-") factor | power
+#   power = atom ("**" factor)?
+#   atom = number | "(" expression ")"
+class AmountParser:
+    def __init__(self, expression: str):
+        self.tokens = tokenize_amount(expression)
+        self.index = 0
+
+    def peek(self) -> tuple[str, str, int]:
+        return self.tokens[self.index]
+
+    def take(self) -> tuple[str, str, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def fail(self, token: tuple[str, str, int], expect: str):
+        kind, text, position = token
+        found = "end of expression" if kind == "end" else f"'{text}'"
+        raise AmountError(f"expect {expect} but found {found}", position)
+
+    def parse(self):
+        value = self.expression()
+        if self.peek()[0] != "end":
+            self.fail(self.peek(), "an operator")
+        return value
+
+    def expression(self):
+        value = self.term()
+        while self.peek()[1] in ("+", "-"):
+            operator = self.take()[1]
+            operand = self.term()
+            value = value + operand if operator == "+" else value - operand
+        return value
+
+    def term(self):
+        value = self.factor()
+        while self.peek()[1] in ("*", "/", "//", "%"):
+            token = self.take()
+            operand = self.factor()
+            if token[1] == "*":
+                value *= operand
+                continue
+            if not operand:
+                raise AmountError("division by zero", token[2])
+            if token[1] == "/":
+                value /= operand
+            elif token[1] == "//":
+                value //= operand
+            else:
+                value %= operand
+        return value
+
+    def factor(self):
+        if self.peek()[1] in ("+", "-"):
+            operator = self.take()[1]
+            value = self.factor()
+            return -value if operator == "-" else value
+        return self.power()
+
+    def power(self):
+        value = self.atom()
+        if self.peek()[1] != "**":
+            return value
+        token = self.take()
+        exponent = self.factor()
+        try:
+            if not (isinstance(exponent, int) and 0 <= exponent <= MAX_INT_EXPONENT):
+                value = float(value)
+            value = value**exponent
+        except OverflowError:
+            raise AmountError("result out of range", token[2])
+        except ZeroDivisionError:
+            raise AmountError("division by zero", token[2])
+        if isinstance(value, complex):
+            raise AmountError("complex result", token[2])
+        return value
+
+    def atom(self):
+        token = self.take()
+        if token[0] == "number":
+            try:
+                return to_number(token[1])
+            except ValueError:
+                raise AmountError(f"invalid number '{token[1]}'", token[2])
+        if token[1] == "(":
+            value = self.expression()
+            if self.peek()[1] != ")":
+                self.fail(self.peek(), "')'")
+            self.take()
+            return value
+        self.fail(token, "a number or '('")
+
+
+# many notes carry the same amounts, so the results are kept
+@lru_cache(maxsize=AMOUNT_CACHE_SIZE)
+def parse_amount(expression: str):
+    return AmountParser(expression).parse()
+
+
+def evaluate_amount(expression: str):
+    if PLAIN_AMOUNT_PATTERN.fullmatch(expression):
+        return to_number(expression)
+    return parse_amount(expression)
@@ -1,3 +1,5 @@
+import json
+
 from cmdapp.core import Response
 from cmdapp.utils import Platform
 from cmdapp.parser import COLUMN_ID, COLUMN_CREATE, COLUMN_DELETE
@@ -5,7 +7,14 @@ from cmdapp.database import SQLCondition, SQLOperators, SQLOrderByDirection, Tab
 from cmdapp.base import Alias, BasePrototype
 
 from ..constants.schema import *
-from ..constants.var import SCOPE_ORDER, SCOPE_SHARING, SCOPE_TX
+from ..constants.var import (
+    SCOPE_ORDER,
+    SCOPE_SHARING,
+    SCOPE_TX,
+    REPORT_IN,
+    REPORT_OUT,
+    INLINE_IDS_LIMIT,
+)
 
 
 from ..app import MoneyApp
@@ -38,6 +47,11 @@ class AppHelper:
             )
         return response
 
+    def save_records(app: MoneyApp, table_meta: TableMeta, data: list[dict]) -> bool:
+        table = app.database[table_meta.name]
+        handler = lambda conn: all([table.insert(item) for item in data])
+        return app.database.with_transaction(handler=handler)
+
     def get_database_errors(app: MoneyApp):
         return BasePrototype.print_database_errors(app)
 
@@ -95,31 +109,96 @@ class AppHelper:
             return sharing_id > 0
         return True
 
-    def save_transactions_in_scope(
+    def save_transactions_in_chunk(
         app: MoneyApp, data: list[dict[str, dict]]
+    ) -> bool:
+        for data_item in data:
+            if not AppHelper.save_transaction_in_scope(app, data_item):
+                return False
+        return True
+
+    # `on_saved(conn, indices)` runs in the transaction that saves the items at
+    # `indices`, so what it writes is kept only with them. Each item is saved in
+    # its own transaction by default, bulk saving like importing passes a
+    # `chunk_size` to commit many items at once
+    def save_transactions_in_scope(
+        app: MoneyApp,
+        data: list[dict[str, dict]],
+        chunk_size: int = 1,
+        on_saved=None,
     ) -> list[int]:
         error_indices = []
-        for index, data_item in enumerate(data):
-            handler = lambda conn: AppHelper.save_transaction_in_scope(app, data_item)
-            success = app.database.with_transaction(handler=handler)
-            if not success:
-                error_indices.append(index)
+        chunk_size = max(int(chunk_size or 1), 1)
+        on_saved = on_saved or (lambda conn, indices: True)
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            # save the whole chunk within one transaction, if it fails then
+            # retry each item separately to find exactly which ones are invalid
+            handler = lambda conn: AppHelper.save_transactions_in_chunk(
+                app, chunk
+            ) and on_saved(conn, range(start, start + len(chunk)))
+            if app.database.with_transaction(handler=handler):
+                continue
+            if len(chunk) == 1:
+                error_indices.append(start)
+                continue
+            for index, data_item in enumerate(chunk, start):
+                handler = lambda conn: AppHelper.save_transaction_in_scope(
+                    app, data_item
+                ) and on_saved(conn, [index])
+                success = app.database.with_transaction(handler=handler)
+                if not success:
+                    error_indices.append(index)
         return error_indices
 
+    def get_ids_filter(column: str, ids: list[int], params: dict) -> str:
+        if len(ids) <= INLINE_IDS_LIMIT:
+            return SQLCondition(column, SQLOperators.IN, ids).build()
+        name = f"ids_{len(params)}"
+        params[name] = json.dumps([int(value) for value in ids])
+        return f"{column} IN (SELECT value FROM json_each(:{name}))"
+
+    def get_id_ranges_filter(
+        table_name: str, ranges: list[tuple[int, int]], params: dict
+    ) -> str:
+        column = f"{table_name}.{COLUMN_ID}"
+        if len(ranges) <= INLINE_IDS_LIMIT:
+            return " OR ".join(
+                [
+                    f"{column} BETWEEN {int(start)} AND {int(end)}"
+                    for start, end in ranges
+                ]
+            )
+        # each range is read through the primary key
+        name = f"ranges_{len(params)}"
+        params[name] = json.dumps([[int(start), int(end)] for start, end in ranges])
+        return f"""{column} IN (
+            SELECT range_row.{COLUMN_ID} FROM json_each(:{name}) AS id_range
+            JOIN {table_name} AS range_row ON range_row.{COLUMN_ID}
+                BETWEEN json_extract(id_range.value, '$[0]')
+                AND json_extract(id_range.value, '$[1]')
+        )"""
+
     def get_sharings(
         app: MoneyApp, tag: int | str = None, sharing_ids: list[int] = None
     ):
+        # an inner join lets the tag filter drive the query through the tag index
+        tag_join = "left join"
+        params = {}
         if sharing_ids:
-            condition = SQLCondition(
-                f"sharing.{COLUMN_ID}", SQLOperators.IN, sharing_ids
+            where = AppHelper.get_ids_filter(
+                f"sharing.{COLUMN_ID}", sharing_ids, params
             )
         else:
-            condition = SQLCondition(
-                f"tx.{COLUMN_DELETE}", SQLOperators.IS_NULL
-            ).AND_GROUP(
-                SQLCondition("tag.name", SQLOperators.EQUAL, tag).OR(
-                    "tag.id", SQLOperators.EQUAL, tag
+            tag_join = "join"
+            where = (
+                SQLCondition(f"tx.{COLUMN_DELETE}", SQLOperators.IS_NULL)
+                .AND_GROUP(
+                    SQLCondition("tag.name", SQLOperators.EQUAL, tag).OR(
+                        "tag.id", SQLOperators.EQUAL, tag
+                    )
                 )
+                .build()
             )
         sql = f"""
         select sharing.id, sharing.people, sharing.shares, sharing.tag,
@@ -127,16 +206,17 @@ class AppHelper:
                    payer_wallet.account as payer, receiver_wallet.account as receiver
         from sharing
         join tx on tx.id = sharing.tx
-        left join tag on tag.id = sharing.tag
+        {tag_join} tag on tag.id = sharing.tag
         left join wallet as payer_wallet on payer_wallet.id = tx.payer
         left join wallet as receiver_wallet on receiver_wallet.id = tx.receiver
-        where {condition.build()}
+        where {where}
         """
 
-        return app.database.query(sql)
+        return app.database.query(sql, params)
 
-    def get_sharing_invoices(app: MoneyApp, sharing_ids: list[int]):
-        condition = SQLCondition(f"sharing.id", SQLOperators.IN, sharing_ids)
+    def get_sharing_invoices_sql(sharing_ids: list[int]) -> tuple[str, dict]:
+        params = {}
+        where = AppHelper.get_ids_filter(f"sharing.id", sharing_ids, params)
         sql = f"""
         select tx.id, tx.timestamp, tx.amount, tx.message, tx.currency,
                    payer_wallet.account as payer, receiver_wallet.account as receiver,
@@ -146,13 +226,22 @@ class AppHelper:
         left join tag on tag.id = sharing.tag
         left join wallet as payer_wallet on payer_wallet.id = tx.payer
         left join wallet as receiver_wallet on receiver_wallet.id = tx.receiver
-        where {condition.build()}
+        where {where}
         """
+        return sql, params
 
-        return app.database.query(sql)
+    def get_sharing_invoices(app: MoneyApp, sharing_ids: list[int]):
+        sql, params = AppHelper.get_sharing_invoices_sql(sharing_ids)
+        return app.database.query(sql, params)
 
-    def filter_transactions(
-        app: MoneyApp,
+    def iterate_sharing_invoices(
+        app: MoneyApp, sharing_ids: list[int], page_size: int = 1000
+    ):
+        for start in range(0, len(sharing_ids), page_size):
+            page_ids = sharing_ids[start : start + page_size]
+            yield from AppHelper.get_sharing_invoices(app, page_ids)
+
+    def get_transaction_filter(
         start_time=None,
         end_time=None,
         currencies: list[str] = None,
@@ -160,9 +249,15 @@ class AppHelper:
         wallets: list[str] = None,
         accounts: list[str] = None,
         ids: list[int] = None,
-    ):
+        id_ranges: list[tuple[int, int]] = None,
+    ) -> tuple[str, dict]:
+        # an inner join lets the category filter drive the query through its index
+        tag_join = "left join"
+        params = {}
         if ids:
-            condition = SQLCondition(f"tx.id", SQLOperators.IN, ids)
+            where = AppHelper.get_ids_filter(f"tx.id", ids, params)
+        elif id_ranges:
+            where = AppHelper.get_id_ranges_filter("tx", id_ranges, params)
         else:
             condition = SQLCondition(f"tx.{COLUMN_DELETE}", SQLOperators.IS_NULL)
             if start_time:
@@ -174,8 +269,9 @@ class AppHelper:
                     f"tx.timestamp", SQLOperators.LESS_THAN_OR_EQUAL, end_time
                 )
             if currencies:
-                condition.AND(f"tx.currencies", SQLOperators.IN, currencies)
+                condition.AND(f"tx.currency", SQLOperators.IN, currencies)
             if categories:
+                tag_join = "join"
                 condition.AND_GROUP(
                     SQLCondition(f"tag.name", SQLOperators.IN, categories).OR(
                         f"tag.id", SQLOperators.IN, categories
@@ -195,21 +291,105 @@ class AppHelper:
                     .OR(f"receiver_account.name", SQLOperators.IN, accounts)
                     .OR(f"receiver_account.id", SQLOperators.IN, accounts)
                 )
+            where = condition.build()
         sql = f"""
-        select tx.id, tx.timestamp, tx.amount, tx.message, tx.currency,
-                  payer_account.name as payer, receiver_account.name as receiver,
-                  payer_wallet.name as source, receiver_wallet.name as destination,
-                  tag.name as category
         from tx
-        left join tag on tag.id = tx.category
+        {tag_join} tag on tag.id = tx.category
         left join wallet as payer_wallet on payer_wallet.id = tx.payer
         left join wallet as receiver_wallet on receiver_wallet.id = tx.receiver
         left join account as payer_account on payer_account.id = payer_wallet.account
         left join account as receiver_account on receiver_account.id = receiver_wallet.account
-        where {condition.build()}
+        where ({where})
+        """
+        return sql, params
+
+    # continue after the `after` transaction in (timestamp, id) order, where
+    # transactions without timestamp come first
+    def get_keyset_filter(after: dict, params: dict) -> str:
+        if not after:
+            return ""
+        params |= dict(after_timestamp=after["timestamp"], after_id=after[COLUMN_ID])
+        if after["timestamp"] is None:
+            return """
+            and ((tx.timestamp is null and tx.id > :after_id)
+                or tx.timestamp is not null)
+            """
+        return "and (tx.timestamp, tx.id) > (:after_timestamp, :after_id)"
+
+    def get_transactions_sql(
+        after: dict = None, limit: int = None, offset: int = None, **filters
+    ) -> tuple[str, dict]:
+        filter_sql, params = AppHelper.get_transaction_filter(**filters)
+        sql = f"""
+        select tx.id, tx.timestamp, tx.amount, tx.message, tx.currency,
+                  payer_account.name as payer, receiver_account.name as receiver,
+                  payer_wallet.name as source, receiver_wallet.name as destination,
+                  tag.name as category
+        {filter_sql}
+        {AppHelper.get_keyset_filter(after, params)}
+        order by tx.timestamp, tx.id
+        """
+        if limit:
+            sql += f"limit {int(limit)} offset {int(offset or 0)}"
+        return sql, params
+
+    def filter_transactions(app: MoneyApp, **filters):
+        sql, params = AppHelper.get_transactions_sql(**filters)
+        return app.database.query(sql, params)
+
+    # pages of `filter_transactions`, each page continues from the last
+    # transaction of the previous one instead of counting an offset again
+    def iterate_transaction_pages(
+        app: MoneyApp, page_size: int, offset: int = 0, **filters
+    ):
+        after = None
+        while True:
+            sql, params = AppHelper.get_transactions_sql(
+                after=after, limit=page_size, offset=offset, **filters
+            )
+            page = app.database.query(sql, params)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after, offset = page[-1], 0
+
+    def iterate_transactions(app: MoneyApp, page_size: int = 1000, **filters):
+        for page in AppHelper.iterate_transaction_pages(app, page_size, **filters):
+            yield from page
+
+    def filter_transaction_ids(app: MoneyApp, **filters) -> list[int]:
+        filter_sql, params = AppHelper.get_transaction_filter(**filters)
+        rows = app.database.query(f"select tx.id {filter_sql}", params)
+        return [row[COLUMN_ID] for row in rows]
+
+    def aggregate_transactions(app: MoneyApp, **filters):
+        # sum amounts going out of and coming into each (wallet, account) per
+        # category and currency, groups are ordered by their first transaction
+        filter_sql, params = AppHelper.get_transaction_filter(**filters)
+        sql = f"""
+        with filtered as (
+            select tx.amount, tx.currency, tag.name as category,
+                  payer_account.name as payer, receiver_account.name as receiver,
+                  payer_wallet.name as source, receiver_wallet.name as destination,
+                  row_number() over (order by tx.timestamp, tx.id) as position
+            {filter_sql}
+        )
+        select category, currency, source as wallet, payer as account,
+                  '{REPORT_OUT}' as direction, sum(amount) as amount,
+                  count(*) as count, min(position) as position
+        from filtered
+        group by category, currency, source, payer
+        union all
+        select category, currency, destination as wallet, receiver as account,
+                  '{REPORT_IN}' as direction, sum(amount) as amount,
+                  0 as count, min(position) as position
+        from filtered
+        group by category, currency, destination, receiver
+        order by position, direction
         """
 
-        return app.database.query(sql)
+        return app.database.query(sql, params)
 
     def get_wallet_balance_from_transactions(
         app: MoneyApp,
@@ -217,27 +397,65 @@ class AppHelper:
         currency: str = None,
         happen_after=None,
         happen_before=None,
+        exclude_currencies: list[str] = None,
     ):
-        sql = f"""
-        SELECT 
-            currency,
-            (SUM(CASE WHEN receiver = :wallet_id THEN amount ELSE 0 END) - 
-            SUM(CASE WHEN payer = :wallet_id THEN amount ELSE 0 END)) AS balance
-        FROM {TABLE_TRANSACTION.name}
-        WHERE 1
-        """
+        # full days are summed from the daily ledger, the partial days at the
+        # bounds are range searches on the (payer | receiver, currency, timestamp) index
+        filters = f"{COLUMN_DELETE} IS NULL"
+        ledger_filters = "count != 0"
         data = dict(wallet_id=wallet_id)
         if currency:
-            sql += f" AND currency = :currency"
+            filters += f" AND currency = :currency"
+            ledger_filters += f" AND currency = :currency"
             data |= dict(currency=currency)
+        if exclude_currencies:
+            excluded = {
+                f"exclude_{index}": value
+                for index, value in enumerate(exclude_currencies)
+            }
+            in_list = ", ".join([f":{key}" for key in excluded])
+            filters += f" AND currency NOT IN ({in_list})"
+            ledger_filters += f" AND currency NOT IN ({in_list})"
+            data |= excluded
+        windows = []
         if happen_after:
-            sql += f" AND timestamp > :later"
+            ledger_filters += " AND day > date(:later)"
+            end = "date(:later, '+1 day')"
+            if happen_before:
+                end = f"min({end}, :before)"
+            windows.append(f"timestamp > :later AND timestamp < {end}")
             data |= dict(later=happen_after)
         if happen_before:
-            sql += f" AND timestamp < :before"
+            ledger_filters += " AND day < date(:before)"
+            start = "date(:before)"
+            if happen_after:
+                start = f"max({start}, date(:later, '+1 day'))"
+            windows.append(f"timestamp >= {start} AND timestamp < :before")
             data |= dict(before=happen_before)
+        if not windows:
+            windows.append("timestamp IS NULL")
 
-        sql += " GROUP BY currency"
+        branches = [
+            f"""
+            SELECT currency, delta AS amount FROM {TABLE_BALANCE.name}
+            WHERE wallet = :wallet_id AND {ledger_filters}
+            """
+        ]
+        for window in windows:
+            branches.append(
+                f"""
+                SELECT currency, amount FROM {TABLE_TRANSACTION.name}
+                WHERE receiver = :wallet_id AND {filters} AND {window}
+                UNION ALL
+                SELECT currency, -amount FROM {TABLE_TRANSACTION.name}
+                WHERE payer = :wallet_id AND {filters} AND {window}
+                """
+            )
+        sql = f"""
+        SELECT currency, SUM(amount) AS balance
+        FROM ({"UNION ALL".join(branches)})
+        GROUP BY currency
+        """
         result = app.database.query(sql, data)
 
         balance_by_currency = {}
@@ -255,3 +473,218 @@ class AppHelper:
             page_size=1,
         )
         return liquidity[0] if liquidity else {}
+
+    # latest active liquidity not later than `timestamp` for each (wallet, currency)
+    def get_liquidity_checkpoints(
+        app: MoneyApp, timestamp, wallet_id: int = None, currency: str = None
+    ) -> list[dict]:
+        filters = f"{COLUMN_DELETE} IS NULL"
+        data = dict(at=timestamp)
+        if wallet_id is not None:
+            filters += " AND wallet = :wallet_id"
+            data |= dict(wallet_id=wallet_id)
+        if currency:
+            filters += " AND currency = :currency"
+            data |= dict(currency=currency)
+        table = TABLE_LIQUIDITY.name
+        sql = f"""
+        SELECT {table}.* FROM (
+            SELECT DISTINCT wallet, currency FROM {table} WHERE {filters}
+        ) AS pair
+        JOIN {table} ON {table}.id = (
+            SELECT checkpoint.id FROM {table} AS checkpoint
+            WHERE checkpoint.wallet = pair.wallet
+                AND checkpoint.currency = pair.currency
+                AND checkpoint.{COLUMN_DELETE} IS NULL
+                AND checkpoint.timestamp <= :at
+            ORDER BY checkpoint.timestamp DESC, checkpoint.id DESC
+            LIMIT 1
+        )
+        ORDER BY {table}.wallet, {table}.currency
+        """
+        return app.database.query(sql, data)
+
+    # balance of the wallet by currency at `timestamp`: the nearest checkpoint
+    # plus the transactions after it, or all transactions without a checkpoint
+    def get_wallet_balance_at(
+        app: MoneyApp,
+        wallet_id: int,
+        timestamp,
+        currency: str = None,
+        checkpoints: list[dict] = None,
+    ) -> dict[str, dict]:
+        if checkpoints is None:
+            checkpoints = AppHelper.get_liquidity_checkpoints(
+                app, timestamp, wallet_id, currency
+            )
+        balances = {}
+        for checkpoint in checkpoints:
+            checkpoint_currency = checkpoint["currency"]
+            delta = AppHelper.get_wallet_balance_from_transactions(
+                app,
+                wallet_id=wallet_id,
+                currency=checkpoint_currency,
+                happen_after=checkpoint["timestamp"],
+                happen_before=timestamp,
+            )
+            balances[checkpoint_currency] = dict(
+                balance=checkpoint["balance"] + delta.get(checkpoint_currency, 0),
+                checkpoint=checkpoint["timestamp"],
+                checkpoint_balance=checkpoint["balance"],
+            )
+        if currency and currency in balances:
+            return balances
+
+        history = AppHelper.get_wallet_balance_from_transactions(
+            app,
+            wallet_id=wallet_id,
+            currency=currency,
+            happen_before=timestamp,
+            exclude_currencies=list(balances),
+        )
+        for history_currency, balance in history.items():
+            balances[history_currency] = dict(
+                balance=balance, checkpoint=None, checkpoint_balance=None
+            )
+        return balances
+
+    # for every (wallet, currency): the last saved liquidity and the total of
+    # transactions after it and before `happen_before`, all in one query
+    def get_balances_since_last_liquidity(app: MoneyApp, happen_before) -> list[dict]:
+        tx = TABLE_TRANSACTION.name
+        active = f"{tx}.{COLUMN_DELETE} IS NULL"
+        sides = [("receiver", f"{tx}.amount"), ("payer", f"-{tx}.amount")]
+        # the rest of the day of the last liquidity
+        first_days = [
+            f"""
+            SELECT last.wallet, last.currency, {amount}, 1, NULL, NULL
+            FROM last JOIN {tx}
+                ON {tx}.{wallet} = last.wallet AND {tx}.currency = last.currency
+            WHERE {active} AND {tx}.timestamp > last.timestamp
+                AND {tx}.timestamp < min(date(last.timestamp, '+1 day'), :before)
+            """
+            for wallet, amount in sides
+        ]
+        # the day of `happen_before`, without the part counted in `first_days`
+        last_days = [
+            f"""
+            SELECT {tx}.{wallet}, {tx}.currency, {amount}, 1, NULL, NULL
+            FROM {tx} LEFT JOIN last
+                ON last.wallet = {tx}.{wallet} AND last.currency = {tx}.currency
+            WHERE {tx}.{wallet} IS NOT NULL AND {active}
+                AND {tx}.timestamp >= date(:before) AND {tx}.timestamp < :before
+                AND (
+                    last.timestamp IS NULL
+                    OR {tx}.timestamp >= date(last.timestamp, '+1 day')
+                )
+            """
+            for wallet, amount in sides
+        ]
+        sql = f"""
+        WITH last AS (
+            SELECT wallet, currency, balance, timestamp FROM (
+                SELECT wallet, currency, balance, timestamp, row_number() OVER (
+                    PARTITION BY wallet, currency
+                    ORDER BY {COLUMN_CREATE} DESC, {COLUMN_ID} DESC
+                ) AS position
+                FROM {TABLE_LIQUIDITY.name} WHERE {COLUMN_DELETE} IS NULL
+            )
+            WHERE position = 1
+        )
+        SELECT wallet, currency, SUM(delta) AS delta, SUM(count) AS count,
+            MAX(last_balance) AS last_balance, MAX(last_timestamp) AS last_timestamp
+        FROM (
+            SELECT wallet, currency, 0 AS delta, 0 AS count,
+                balance AS last_balance, timestamp AS last_timestamp
+            FROM last
+            UNION ALL
+            SELECT ledger.wallet, ledger.currency, ledger.delta, ledger.count,
+                NULL, NULL
+            FROM {TABLE_BALANCE.name} AS ledger LEFT JOIN last
+                ON last.wallet = ledger.wallet AND last.currency = ledger.currency
+            WHERE ledger.count != 0 AND ledger.day < date(:before)
+                AND (last.timestamp IS NULL OR ledger.day > date(last.timestamp))
+            UNION ALL
+            {"UNION ALL".join(first_days + last_days)}
+        )
+        GROUP BY wallet, currency
+        ORDER BY wallet, currency
+        """
+        return app.database.query(sql, dict(before=happen_before))
+
+    # recalculate the balance of every saved liquidity in timestamp order, like
+    # `check` does: the previous liquidity balance plus the transactions between
+    # both timestamps, using running sums over one ordered pass
+    def audit_liquidities(app: MoneyApp, wallet_id: int = None) -> list[dict]:
+        tx = TABLE_TRANSACTION.name
+        liquidity = TABLE_LIQUIDITY.name
+        liquidity_filters = f"{COLUMN_DELETE} IS NULL"
+        data = {}
+        if wallet_id is not None:
+            liquidity_filters += " AND wallet = :wallet_id"
+            data |= dict(wallet_id=wallet_id)
+        tx_filters = f"{COLUMN_DELETE} IS NULL AND timestamp IS NOT NULL"
+        events = [
+            f"""
+            SELECT {wallet} AS wallet, currency, timestamp, {amount} AS amount,
+                NULL AS liquidity
+            FROM {tx}
+            WHERE {tx_filters} AND {wallet} IN (
+                SELECT wallet FROM {liquidity} WHERE {liquidity_filters}
+            )
+            """
+            for wallet, amount in [("receiver", "amount"), ("payer", "-amount")]
+        ]
+        sql = f"""
+        WITH events AS (
+            {"UNION ALL".join(events)}
+            UNION ALL
+            SELECT wallet, currency, timestamp, 0, {COLUMN_ID}
+            FROM {liquidity} WHERE {liquidity_filters}
+        ),
+        running AS (
+            SELECT liquidity,
+                SUM(amount) OVER (
+                    PARTITION BY wallet, currency ORDER BY timestamp
+                    RANGE UNBOUNDED PRECEDING
+                ) AS until_time,
+                SUM(amount) OVER (PARTITION BY wallet, currency, timestamp) AS at_time
+            FROM events
+        ),
+        checkpoints AS (
+            SELECT {liquidity}.{COLUMN_ID}, {liquidity}.wallet, {liquidity}.currency,
+                {liquidity}.timestamp, {liquidity}.balance, {liquidity}.calculate,
+                running.until_time - running.at_time AS before_time,
+                running.until_time
+            FROM running JOIN {liquidity}
+                ON {liquidity}.{COLUMN_ID} = running.liquidity
+        )
+        SELECT {COLUMN_ID}, wallet, currency, timestamp, balance, calculate,
+            CASE
+                WHEN previous_timestamp IS NULL THEN before_time
+                WHEN previous_timestamp = timestamp THEN previous_balance
+                ELSE previous_balance + before_time - previous_until
+            END AS expected
+        FROM (
+            SELECT *,
+                LAG(balance) OVER checkpoint_order AS previous_balance,
+                LAG(until_time) OVER checkpoint_order AS previous_until,
+                LAG(timestamp) OVER checkpoint_order AS previous_timestamp
+            FROM checkpoints
+            WINDOW checkpoint_order AS (
+                PARTITION BY wallet, currency ORDER BY timestamp, {COLUMN_ID}
+            )
+        )
+        ORDER BY wallet, currency, timestamp, {COLUMN_ID}
+        """
+        return app.database.query(sql, data)
+
+    def update_liquidity_calculations(app: MoneyApp, calculations: dict) -> bool:
+        sql = f"UPDATE {TABLE_LIQUIDITY.name} SET calculate = ? WHERE {COLUMN_ID} = ?"
+        rows = [(value, liquidity_id) for liquidity_id, value in calculations.items()]
+
+        def handler(conn):
+            conn.executemany(sql, rows)
+            return True
+
+        return app.database.with_transaction(handler=handler)
@@ -0,0 +1,65 @@
+from cmdapp.database import Database
+from cmdapp.parser import COLUMN_DELETE
+
+from ..constants.schema import *
+from ..constants.trigger import LEDGER_COLUMNS
+
+
+class BalanceHelper:
+    def get_daily_balance_sql() -> str:
+        filters = f"timestamp IS NOT NULL AND {COLUMN_DELETE} IS NULL"
+        return f"""
+        SELECT wallet, currency, day, SUM(delta) AS delta, COUNT(*) AS count
+        FROM (
+            SELECT receiver AS wallet, currency, date(timestamp) AS day, amount AS delta
+            FROM {TABLE_TRANSACTION.name}
+            WHERE receiver IS NOT NULL AND {filters}
+            UNION ALL
+            SELECT payer, currency, date(timestamp), -amount
+            FROM {TABLE_TRANSACTION.name}
+            WHERE payer IS NOT NULL AND {filters}
+        )
+        GROUP BY wallet, currency, day
+        """
+
+    def rebuild(database: Database) -> bool:
+        def handler(conn):
+            conn.execute(f"DELETE FROM {TABLE_BALANCE.name}")
+            conn.execute(
+                f"INSERT INTO {TABLE_BALANCE.name} ({', '.join(LEDGER_COLUMNS)})"
+                + BalanceHelper.get_daily_balance_sql()
+            )
+            return True
+
+        return database.with_transaction(handler=handler)
+
+    # days whose saved balance differs from the one summarized from transactions
+    def verify(database: Database) -> list[dict]:
+        sql = f"""
+        SELECT wallet, currency, day,
+            SUM(expected_delta) AS expected_delta, SUM(saved_delta) AS saved_delta,
+            SUM(expected_count) AS expected_count, SUM(saved_count) AS saved_count
+        FROM (
+            SELECT wallet, currency, day, delta AS expected_delta, 0 AS saved_delta,
+                count AS expected_count, 0 AS saved_count
+            FROM ({BalanceHelper.get_daily_balance_sql()})
+            UNION ALL
+            SELECT wallet, currency, day, 0, delta, 0, count
+            FROM {TABLE_BALANCE.name}
+        )
+        GROUP BY wallet, currency, day
+        HAVING ABS(SUM(expected_delta) - SUM(saved_delta)) > 1e-6
+            OR SUM(expected_count) != SUM(saved_count)
+        ORDER BY wallet, currency, day
+        """
+        return database.query(sql)
+
+    # the ledger is filled by triggers, so transactions saved before the
+    # triggers were created have to be summarized once
+    def prepare(database: Database) -> bool:
+        result = database.query(
+            f"SELECT EXISTS (SELECT 1 FROM {TABLE_BALANCE.name}) AS built"
+        )
+        if result and result[0]["built"]:
+            return True
+        return BalanceHelper.rebuild(database)
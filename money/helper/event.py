@@ -120,16 +120,23 @@ class EventHelper:
         EventHelper.report_transfers(response, bills, name_resolver)
         return response
 
-    def get_sharing_invoices(app: MoneyApp, sharing_ids: list[int]):
+    # replace account ids of an invoice by their names
+    def get_invoice_mapper(app: MoneyApp):
         account_names = app.database[TABLE_ACCOUNT.name].get_columns(["name"])
         name_resolver = lambda key: account_names.get(key, key) or ""
 
-        invoice_transactions = AppHelper.get_sharing_invoices(app, sharing_ids)
-        for record in invoice_transactions:
+        def mapper(record: dict) -> dict:
             record["people"] = [name_resolver(key) for key in record["people"]]
             record["payer"] = name_resolver(record["payer"])
             record["receiver"] = name_resolver(record["receiver"])
-        return invoice_transactions
+            return record
+
+        return mapper
+
+    def get_sharing_invoices(app: MoneyApp, sharing_ids: list[int]):
+        mapper = EventHelper.get_invoice_mapper(app)
+        invoice_transactions = AppHelper.get_sharing_invoices(app, sharing_ids)
+        return [mapper(record) for record in invoice_transactions]
 
     def analyze_sharing(
         sharings: list[dict],
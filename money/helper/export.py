@@ -0,0 +1,83 @@
+import csv
+import gzip
+import json
+
+from cmdapp.core import Response
+from cmdapp.utils import Platform
+
+from ..constants.var import EXPORT_STREAM_FORMATS
+from ..app import MoneyApp
+
+
+class ExportHelper:
+    def is_streamable(format: str) -> bool:
+        return format in EXPORT_STREAM_FORMATS
+
+    def open_file(path: str):
+        if path.endswith(".gz"):
+            return gzip.open(path, "wt", encoding="utf-8", newline="")
+        return open(path, "w", encoding="utf-8", newline="")
+
+    # renamed fields go first, in the order of `rename`
+    def rename_row(row: dict, rename: dict = None) -> dict:
+        if not rename:
+            return row
+        renamed = {rename[key]: row[key] for key in rename if key in row}
+        return renamed | {key: value for key, value in row.items() if key not in rename}
+
+    def write_csv(file, rows, **options) -> int:
+        count = 0
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(
+                    file, fieldnames=list(row), extrasaction="ignore"
+                )
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+        return count
+
+    def write_jsonl(file, rows, **options) -> int:
+        count = 0
+        for row in rows:
+            file.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            count += 1
+        return count
+
+    def write_rows(rows, path: str, format: str, **options) -> int:
+        writer = getattr(ExportHelper, f"write_{format}")
+        with ExportHelper.open_file(path) as file:
+            return writer(file, rows, **options)
+
+    # write the rows into the file while they are read page by page, so the
+    # whole result is never kept in memory
+    def export_rows(
+        app: MoneyApp,
+        rows,
+        path: str,
+        format: str,
+        mapper=None,
+        rename: dict = None,
+        what: str = "item",
+        **options,
+    ) -> Response:
+        response = Response(app)
+        if mapper:
+            rows = map(mapper, rows)
+        rows = (ExportHelper.rename_row(row, rename) for row in rows)
+        try:
+            count = ExportHelper.write_rows(rows, path, format, **options)
+        except Exception as error:
+            return response.on("error").message(
+                "exception", style="error", message=error
+            )
+        return response.message(
+            "action",
+            style="success",
+            action="EXPORT",
+            what=what,
+            argument="count",
+            value=count,
+            result=f"Check the file at [{Platform.abs(path)}]",
+        )
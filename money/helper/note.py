@@ -1,21 +1,45 @@
 import re
 import os
+import copy
+import json
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import cache
+from itertools import islice
 
 from cmdapp.core import Response
 from cmdapp.utils import URI, Hash
 from cmdapp.parser import COLUMN_ID, COLUMN_DELETE, COLUMN_CREATE, COLUMN_UPDATE
-from cmdapp.database import SQLCondition
-
-from cmdapp.base import Alias
+from cmdapp.database import SQLCondition, SQLOperators
 
 from ..constants.schema import *
-from ..constants.var import SCOPE_ORDER, SCOPE_SHARING, SCOPE_TX, SHARE_NOTE_PATTERN
+from ..constants.var import (
+    SCOPE_ORDER,
+    SCOPE_SHARING,
+    SCOPE_TX,
+    SHARE_NOTE_PATTERN,
+    CONFIG_NOTE_FIELDNAMES,
+    MONOGRAPH_URL,
+    NOTESNOOK_FORMAT,
+    WATCH_MAX_DELAY,
+    WORKER_RANGE_SIZE,
+)
 from ..notes import *
 
 from ..app import MoneyApp
 
 from .app import AppHelper
+from .alias import AliasMap
+from .worker import (
+    NoteWorker,
+    init_worker,
+    parse_notes_in_worker,
+    parse_range_in_worker,
+)
+from .amount import AmountError, evaluate_amount
 
 
 NOTE_ALLOW_FIELDS = set(
@@ -26,27 +50,116 @@ NOTE_ALLOW_FIELDS = set(
 
 
 class NoteHelper:
-    def eval_amount(input: str):
-        expression = input.replace("^", "**").replace(",", "")
-        if re.fullmatch(r"[\d\.\+\-*/%()]+", expression):
-            try:
-                return eval(expression)
-            except:
-                pass
-        raise ValueError(
-            f"Invalid 'amount' [{input}], expect a float or a math expression"
-        )
+    def eval_amount(input):
+        if isinstance(input, (int, float)) and not isinstance(input, bool):
+            return input
+        try:
+            return evaluate_amount(str(input))
+        except AmountError as error:
+            raise ValueError(
+                f"Invalid 'amount' [{input}], expect a float or a math expression: "
+                + f"{error.message} at character {error.position + 1}"
+            )
 
     def parse_from_url(url, last_record=None, format=None):
+        return list(NoteHelper.iterate_from_url(url, last_record, format))
+
+    def is_remote(url) -> bool:
+        return URI.resolve(url)[1]
+
+    def iterate_from_url(
+        url,
+        last_record=None,
+        format=None,
+        position: dict = None,
+        session=None,
+        only_modified: bool = False,
+        html_parser: str = None,
+    ):
         path, is_remote = URI.resolve(url)
-        if not is_remote:
-            data = LocalParser.parse(path, format or None)
-        elif path.startswith("https://monogr.ph/"):
-            data = NotesnookParser.parse(path)
-        new_data = data if not last_record else NotesParser.find_new(data, last_record)
-        return new_data
-
-    def sanitize_transaction(aliases: Alias, note: dict):
+        if is_remote:
+            if path.startswith(MONOGRAPH_URL) or format == NOTESNOOK_FORMAT:
+                data = NotesnookParser.parse(
+                    path,
+                    session=session,
+                    only_modified=only_modified,
+                    html_parser=html_parser or HTML_PARSER_STREAM,
+                )
+            yield from (
+                data if not last_record else NotesParser.find_new(data, last_record)
+            )
+            return
+        # local files are read twice instead of holding all notes in memory:
+        # first to locate the last imported record, then to stream the new ones
+        start = 0
+        if last_record:
+            start = NotesParser.find_index(
+                LocalParser.iterate(path, format or None), last_record
+            )
+            start += 1
+        notes = LocalParser.iterate(path, format or None, position)
+        yield from islice(notes, start, None)
+
+    def create_session(pool_size: int):
+        return NotesnookParser.create_session(pool_size)
+
+    def fetch_notes(url, options: dict, session=None, only_modified=False) -> list:
+        notes = NoteHelper.iterate_from_url(
+            url,
+            format=options.get("format"),
+            session=session,
+            only_modified=only_modified,
+            html_parser=options.get("html_parser"),
+        )
+        return list(notes)
+
+    def release_page(url, saved: bool):
+        path, is_remote = URI.resolve(url)
+        if is_remote:
+            NotesnookParser.release_page(path, saved)
+
+    def get_resources(app: MoneyApp) -> list[dict]:
+        return app.database[TABLE_RESOURCE.name].query(
+            condition=SQLCondition(COLUMN_DELETE, SQLOperators.IS_NULL)
+        )
+
+    def get_import_options(resource: dict, option: dict = None) -> dict:
+        return (resource.get("option") or {}) | dict(option or {})
+
+    def get_resume_offset(url, resource: dict, format=None) -> int:
+        path, is_remote = URI.resolve(url)
+        offset = resource.get("last_offset") or 0
+        if is_remote or not offset or not LocalParser.is_resumable(path, format):
+            return 0
+        # the file was truncated or rewritten, so it is read from the beginning
+        if os.path.getsize(path) < offset:
+            return 0
+        if LocalParser.fingerprint(path, offset) != resource.get("fingerprint"):
+            return 0
+        return offset
+
+    def get_file_cursor(url, offset: int, format=None) -> dict:
+        path, is_remote = URI.resolve(url)
+        if is_remote or not LocalParser.is_resumable(path, format):
+            return {}
+        return dict(
+            last_offset=offset,
+            last_size=os.path.getsize(path),
+            fingerprint=LocalParser.fingerprint(path, offset),
+        )
+
+    def count_imported_notes(notes, last_record: dict) -> int:
+        return NotesParser.find_index(notes, last_record) + 1
+
+    def chunk_notes(notes, chunk_size: int):
+        notes = iter(notes)
+        chunk_size = max(int(chunk_size or 1), 1)
+        offset = 0
+        while chunk := list(islice(notes, chunk_size)):
+            yield offset, chunk
+            offset += len(chunk)
+
+    def sanitize_transaction(aliases: AliasMap, note: dict):
         note["payer"] = aliases.resolve(TABLE_WALLET.name, note.get("payer"))
         note["receiver"] = aliases.resolve(TABLE_WALLET.name, note.get("receiver"))
         note["category"] = aliases.resolve(TABLE_TAG.name, note.get("category"))
@@ -58,7 +171,7 @@ class NoteHelper:
 
         return sanitized_note
 
-    def sanitize_order(aliases: Alias, note: dict):
+    def sanitize_order(aliases: AliasMap, note: dict):
         items = note.pop("items", "")
         if isinstance(items, (list, tuple)):
             note["items"] = items
@@ -70,7 +183,7 @@ class NoteHelper:
             raise ValueError("Missing order items")
         return sanitized_note
 
-    def sanitize_sharing(aliases: Alias, note: dict):
+    def sanitize_sharing(aliases: AliasMap, note: dict):
         shares = note.get("shares", "")
         if not isinstance(shares, (list, tuple)):
             items = re.findall(SHARE_NOTE_PATTERN, str(shares))
@@ -81,27 +194,32 @@ class NoteHelper:
         else:
             people = note.get("people", [])
         note["tag"] = aliases.resolve(TABLE_TAG.name, note.get("tag"))
-        note["people"] = aliases.resolve(TABLE_ACCOUNT.name, people) or []
-        note["shares"] = [float(sh) for sh in shares] + [1.0] * (
-            len(note["people"]) - len(shares)  # empty array if negative
+        ids = aliases.resolve_aligned(TABLE_ACCOUNT.name, people) or []
+        shares = [float(sh) for sh in shares] + [1.0] * (
+            len(ids) - len(shares)  # empty array if negative
         )
+        # unknown people are left out with their shares
+        unknown = {index for index, id in enumerate(ids) if id is None}
+        note["people"] = [id for id in ids if id is not None]
+        note["shares"] = [sh for index, sh in enumerate(shares) if index not in unknown]
         sanitized_note: dict = TABLE_SHARING.sanitize_data(note)
         if not (sanitized_note.get("people")):
             raise ValueError("Missing shared people")
         return sanitized_note
 
     def parse_notes(
-        aliases: Alias,
+        aliases: AliasMap,
         note_entries: list[dict],
         scope: str = None,
         options: dict = None,
         rename: dict[str, str] = None,
+        start: int = 0,
     ):
         result = []
         error_with_indices = []
-        options = options or {}
+        options = dict(options or {})
         scale = float(options.pop("scale", 1.0))
-        for index, note in enumerate(note_entries):
+        for index, note in enumerate(note_entries, start):
             try:
                 _note = Hash.filter(note, *NOTE_ALLOW_FIELDS, rename=rename or {})
                 _note = Hash.merge(_note, options)
@@ -119,8 +237,77 @@ class NoteHelper:
                 error_with_indices.append((index, err))
         return result, error_with_indices
 
-    def update_last_record(app: MoneyApp, resource_id: int, last_record: dict):
+    # read and parse a local file from `offset` by byte ranges in `workers`
+    # processes, the parsed ranges are yielded in the reading order
+    def parse_ranges(
+        aliases: AliasMap,
+        path: str,
+        format: str = None,
+        offset: int = 0,
+        workers: int = 0,
+        **options,
+    ):
+        ranges = LocalParser.split_ranges(path, format, offset, WORKER_RANGE_SIZE)
+        if (workers or 0) <= 1:
+            parser = NoteWorker(aliases)
+            for start, end in ranges:
+                yield parser.parse_range(path, format, start, end, options)
+            return
+
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(aliases,)
+        ) as pool:
+            pending = deque()
+            for start, end in ranges:
+                pending.append(
+                    pool.submit(
+                        parse_range_in_worker, path, format, start, end, options
+                    )
+                )
+                # a few ranges are split ahead to keep every process busy
+                if len(pending) > workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    # parse the `(start, chunk, context)` items with `workers` processes, results
+    # are yielded in the reading order as `(start, chunk, context, data, errors)`
+    def parse_chunks(aliases: AliasMap, chunks, workers: int = 0, **options):
+        if (workers or 0) <= 1:
+            for start, chunk, context in chunks:
+                yield start, chunk, context, *NoteHelper.parse_notes(
+                    aliases, chunk, start=start, **options
+                )
+            return
+
+        def collect(start, chunk, context, future):
+            if future is None:
+                return start, chunk, context, [], []
+            sanitized_data, error_with_indices, unknown = future.result()
+            aliases.add_unknown(unknown)
+            return start, chunk, context, sanitized_data, error_with_indices
+
+        # the alias map is sent once to each process
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(aliases,)
+        ) as pool:
+            pending = deque()
+            for start, chunk, context in chunks:
+                future = None
+                if chunk:
+                    future = pool.submit(parse_notes_in_worker, chunk, start, options)
+                pending.append((start, chunk, context, future))
+                # a few chunks are read ahead to keep every process busy
+                if len(pending) > workers * 2:
+                    yield collect(*pending.popleft())
+            while pending:
+                yield collect(*pending.popleft())
+
+    def update_last_record(
+        app: MoneyApp, resource_id: int, last_record: dict, cursor: dict = None
+    ):
         updated_value = dict(last_import=datetime.now(), last_record=last_record)
+        updated_value |= cursor or {}
         success = app.database[TABLE_RESOURCE.name].update(
             updated_value, SQLCondition.with_id(resource_id)
         )
@@ -141,5 +328,482 @@ class NoteHelper:
             )
         return response
 
+    def digest_note(note: dict) -> str:
+        content = json.dumps(note, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def hash_digest(digest: str, occurrences: dict[str, int]) -> str:
+        occurrence = occurrences[digest] = occurrences.get(digest, 0) + 1
+        # identical notes are allowed, tell them apart by their occurrence
+        return digest if occurrence == 1 else f"{digest}:{occurrence}"
+
+    # number of the notes with each digest read from the resource before,
+    # all their hashes (`digest`, `digest:2`,...) sort between `digest` and `digest;`
+    def get_note_occurrences(
+        app: MoneyApp, resource_id: int, digests: list[str]
+    ) -> dict[str, int]:
+        if not digests:
+            return {}
+        sql = f"""
+        SELECT digest.value AS digest, COUNT(*) AS count
+        FROM json_each(:digests) AS digest
+        JOIN {TABLE_NOTE_HASH.name} AS note_hash
+            ON note_hash.resource = :resource
+            AND note_hash.hash >= digest.value
+            AND note_hash.hash < digest.value || ';'
+        GROUP BY digest.value
+        """
+        params = dict(resource=resource_id, digests=json.dumps(list(digests)))
+        records = app.database.query(sql, params)
+        return {record["digest"]: record["count"] for record in records}
+
+    def has_note_hashes(app: MoneyApp, resource_id: int) -> bool:
+        sql = f"SELECT 1 FROM {TABLE_NOTE_HASH.name} WHERE resource = :resource LIMIT 1"
+        return bool(app.database.query(sql, dict(resource=resource_id)))
+
+    def get_known_note_hashes(
+        app: MoneyApp, resource_id: int, hashes: list[str]
+    ) -> set[str]:
+        if not hashes:
+            return set()
+        condition = SQLCondition("resource", SQLOperators.EQUAL, resource_id).AND(
+            "hash", SQLOperators.IN, hashes
+        )
+        sql = f"SELECT hash FROM {TABLE_NOTE_HASH.name} WHERE {condition.build()}"
+        return {record["hash"] for record in app.database.query(sql)}
+
+    def insert_note_hashes(conn, resource_id: int, hashes: list[str]) -> bool:
+        sql = f"""
+        INSERT OR IGNORE INTO {TABLE_NOTE_HASH.name} (resource, hash, {COLUMN_CREATE})
+        VALUES (?, ?, ?)
+        """
+        created_at = datetime.now()
+        rows = [(resource_id, note_hash, created_at) for note_hash in hashes]
+        conn.executemany(sql, rows)
+        return True
+
+    def save_note_hashes(app: MoneyApp, resource_id: int, hashes: list[str]) -> bool:
+        if not hashes:
+            return True
+        return app.database.with_transaction(
+            handler=lambda conn: NoteHelper.insert_note_hashes(
+                conn, resource_id, hashes
+            )
+        )
+
     def get_error_log_file(dir: str):
         return os.path.join(dir, f'{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}.json')
+
+    def import_notes(
+        app: MoneyApp, args, metadata: dict, fetch=None, summary: dict = None
+    ) -> Response:
+        response = Response(app)
+        resource_link, note_scope, last_import_record = Hash.get(
+            metadata,
+            link=args.link,
+            scope=args.scope,
+            last_record=None,
+        )
+        options = NoteHelper.get_import_options(metadata, args.option)
+
+        # get notes, they are read lazily and processed chunk by chunk
+        note_format = options.get("format")
+        position = {"offset": 0}
+        resource_id = metadata.get(COLUMN_ID)
+        # remote notes are fetched once, even if they are read twice. An unchanged
+        # page only means no new notes for the saved resource that imported it
+        if not fetch and NoteHelper.is_remote(resource_link):
+            fetch = cache(
+                lambda: NoteHelper.fetch_notes(
+                    resource_link,
+                    options,
+                    only_modified=bool(resource_id) and not args.force,
+                )
+            )
+        read_notes = lambda position=None: (
+            fetch()
+            if fetch
+            else NoteHelper.iterate_from_url(
+                resource_link, format=note_format, position=position
+            )
+        )
+        check_duplicate = bool(resource_id) and not args.force
+
+        aliases = AliasMap(
+            app.database,
+            [TABLE_ACCOUNT.name, TABLE_TAG.name, TABLE_WALLET.name],
+            strict=args.strict,
+        )
+        field_to_name = app.config.get(CONFIG_NOTE_FIELDNAMES, default={})
+        rename = {v: k for k, v in field_to_name.items()}
+
+        invalid_data = []
+        error_log_file = NoteHelper.get_error_log_file(args.reserved)
+        count, saved_count, save_error_count, last_note = 0, 0, 0, None
+        read_count, occurrences, imported_count, failed = 0, {}, 0, False
+        cursor_offset = 0
+        try:
+            # an append-only local file is read from where the last import stopped,
+            # the notes after that position are new and need no duplicating check
+            if check_duplicate:
+                position["offset"] = NoteHelper.get_resume_offset(
+                    resource_link, metadata, note_format
+                )
+                check_duplicate = not position["offset"]
+            # the identical notes of a resumed tail are numbered after those read before
+            resumed = bool(position["offset"])
+            # notes imported before hashes were recorded are found by the last record
+            if (
+                check_duplicate
+                and last_import_record
+                and not NoteHelper.has_note_hashes(app, resource_id)
+            ):
+                imported_count = NoteHelper.count_imported_notes(
+                    read_notes(), last_import_record
+                )
+
+            # the new notes among the read ones, found by the hashes of their digests
+            def select_new_notes(digests: list[str], read_offset: int):
+                if resumed:
+                    unseen = set(digests).difference(occurrences)
+                    occurrences.update(dict.fromkeys(unseen, 0))
+                    occurrences.update(
+                        NoteHelper.get_note_occurrences(app, resource_id, unseen)
+                    )
+                hashes = [NoteHelper.hash_digest(d, occurrences) for d in digests]
+                known_hashes = (
+                    NoteHelper.get_known_note_hashes(app, resource_id, hashes)
+                    if check_duplicate
+                    else set()
+                )
+                positions = [
+                    index
+                    for index, note_hash in enumerate(hashes)
+                    if index + read_offset >= imported_count
+                    and note_hash not in known_hashes
+                ]
+                return hashes, positions
+
+            # chunks are read here and may be parsed by other processes, the reading
+            # progress is only kept once their notes are saved
+            def read_new_chunks():
+                read_offset, new_count = 0, 0
+                notes = read_notes(position)
+                for _, read_chunk in NoteHelper.chunk_notes(notes, args.chunk):
+                    digests = [NoteHelper.digest_note(note) for note in read_chunk]
+                    hashes, positions = select_new_notes(digests, read_offset)
+                    chunk = [read_chunk[index] for index in positions]
+                    read_offset += len(read_chunk)
+                    progress = dict(
+                        count=len(read_chunk),
+                        last=read_chunk[-1],
+                        hashes=hashes,
+                        new_hashes=[hashes[index] for index in positions],
+                        offset=position["offset"],
+                    )
+                    yield new_count, chunk, progress
+                    new_count += len(chunk)
+
+            def parse_new_chunks():
+                parsed_chunks = NoteHelper.parse_chunks(
+                    aliases, read_new_chunks(), workers=args.workers, **parse_options
+                )
+                for offset, chunk, progress, *parsed in parsed_chunks:
+                    sanitized_data, error_with_indices = parsed
+                    error_positions = {
+                        index - offset for index, _ in error_with_indices
+                    }
+                    progress["valid_hashes"] = [
+                        note_hash
+                        for index, note_hash in enumerate(progress["new_hashes"])
+                        if index not in error_positions
+                    ]
+                    invalid = [
+                        (index, chunk[index - offset], error)
+                        for index, error in error_with_indices
+                    ]
+                    yield offset, len(chunk), progress, sanitized_data, invalid
+
+            # the processes read and parse byte ranges of a local file by themselves,
+            # the results of the notes imported before are dropped here
+            def parse_new_ranges():
+                read_offset, new_count = 0, 0
+                parsed_ranges = NoteHelper.parse_ranges(
+                    aliases,
+                    local_path,
+                    note_format,
+                    position["offset"],
+                    workers=args.workers,
+                    **parse_options,
+                )
+                for parsed in parsed_ranges:
+                    hashes, positions = select_new_notes(parsed["digests"], read_offset)
+                    read_offset += parsed["count"]
+                    if not parsed["count"]:
+                        continue
+                    ranks = {index: rank for rank, index in enumerate(positions)}
+                    for index, unknown in parsed["unknown"].items():
+                        if index in ranks:
+                            aliases.add_unknown(unknown)
+                    data = [(i, item) for i, item in parsed["data"] if i in ranks]
+                    progress = dict(
+                        count=parsed["count"],
+                        last=parsed["last"],
+                        hashes=hashes,
+                        valid_hashes=[hashes[index] for index, _ in data],
+                        offset=parsed["end"],
+                    )
+                    invalid = [
+                        (new_count + ranks[index], note, error)
+                        for index, note, error in parsed["errors"]
+                        if index in ranks
+                    ]
+                    sanitized_data = [item for _, item in data]
+                    yield new_count, len(positions), progress, sanitized_data, invalid
+                    new_count += len(positions)
+
+            parse_options = dict(scope=note_scope, options=options, rename=rename)
+            local_path, is_remote = URI.resolve(resource_link)
+            use_ranges = (
+                (args.workers or 0) > 1
+                and not fetch
+                and not is_remote
+                and LocalParser.is_resumable(local_path, note_format)
+            )
+            new_chunks = parse_new_ranges() if use_ranges else parse_new_chunks()
+            for offset, new_count, progress, sanitized_data, invalid in new_chunks:
+                last_note = progress["last"]
+                read_count += progress["count"]
+                cursor_offset = progress["offset"]
+                count += new_count
+                # the hashes of the valid notes are saved with their transactions,
+                # so a note is only seen once it is imported
+                valid_hashes = progress["valid_hashes"]
+                if resource_id:
+                    saved_later = set(valid_hashes)
+                    NoteHelper.save_note_hashes(
+                        app,
+                        resource_id,
+                        [h for h in progress["hashes"] if h not in saved_later],
+                    )
+                if not new_count:
+                    continue
+
+                # print invalid records
+                response.on("error")
+                for index, note, error in invalid:
+                    response.message(
+                        "action",
+                        style="error",
+                        action="PARSE",
+                        what="notes to transactions",
+                        argument=f"notes[{index + 1}]",
+                        value=note,
+                        reason=error,
+                    )
+                    invalid_data.append(note | {"error": str(error)})
+                if not sanitized_data:
+                    continue
+
+                # print valid record - which about to saved
+                if not args.quiet:
+                    response.on("output").message(
+                        "found",
+                        style="info",
+                        count=len(sanitized_data),
+                        what="new notes",
+                        result="Prepare to import following notes:",
+                    )
+                    response.json(
+                        sanitized_data, separator=" | ", indent=1, allow_unicode=True
+                    )
+
+                # save into database
+                def save_hashes(conn, indices):
+                    if not resource_id:
+                        return True
+                    hashes = [valid_hashes[index] for index in indices]
+                    return NoteHelper.insert_note_hashes(conn, resource_id, hashes)
+
+                error_indices = AppHelper.save_transactions_in_scope(
+                    app, sanitized_data, args.chunk, on_saved=save_hashes
+                )
+                saved_count += len(sanitized_data) - len(error_indices)
+                save_error_count += len(error_indices)
+                invalid_data.extend(
+                    [
+                        sanitized_data[index] | {"error": "save error"}
+                        for index in error_indices
+                    ]
+                )
+        except Exception as err:
+            response.message("exception", message=err, argument=resource_link)
+            failed = err
+
+        for table_name, unknown in aliases.unknown.items():
+            if unknown:
+                response.on("error").message(
+                    "found",
+                    style="warning",
+                    count=len(unknown),
+                    what=f"unknown {table_name} names",
+                    inside="notes",
+                    items=[f"{name} ({count})" for name, count in unknown.items()],
+                )
+
+        # save last record and reading position to note resource database
+        if args.resource and read_count:
+            # notes that failed to be saved have no hash, the whole file is read
+            # again next time to find them
+            cursor = NoteHelper.get_file_cursor(
+                resource_link,
+                0 if save_error_count else cursor_offset,
+                note_format,
+            )
+            response.concat(
+                NoteHelper.update_last_record(app, resource_id, last_note, cursor)
+            )
+        NoteHelper.release_page(
+            resource_link, bool(resource_id) and not (failed or save_error_count)
+        )
+
+        if summary is not None:
+            summary |= dict(
+                read=read_count,
+                new=count,
+                saved=saved_count,
+                invalid=len(invalid_data),
+                error=failed,
+            )
+        if not count:
+            return (
+                response
+                if failed
+                else response.message(
+                    "found", style="info", negative=True, what="new notes"
+                )
+            )
+
+        message_kwargs = dict(action="IMPORT", what="notes")
+        if not save_error_count:
+            response.on("output").message(
+                "action",
+                style="success",
+                result=f"{saved_count} notes were saved",
+                **message_kwargs,
+            )
+        else:
+            response.on("error").message("action", style="error", **message_kwargs)
+        # save all invalid data: parse error, save error,...
+        if invalid_data and args.reserved:
+            response.on("error").json(invalid_data, path=error_log_file)
+        return response.concat(AppHelper.get_database_errors(app))
+
+    def get_file_state(path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    # the last line of a file without a trailing line break may still be written
+    def ends_with_newline(path: str) -> bool:
+        with open(path, "rb") as file:
+            if not file.seek(0, os.SEEK_END):
+                return True
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) in (b"\n", b"\r")
+
+    def is_watchable(metadata: dict, option: dict = None) -> bool:
+        path, is_remote = URI.resolve(metadata["link"])
+        options = NoteHelper.get_import_options(metadata, option)
+        return not is_remote and LocalParser.is_resumable(path, options.get("format"))
+
+    # poll the files of local resources and import their appended notes. A burst
+    # of writes is imported at once, after the file is unchanged for `debounce`.
+    # A summary of every import is written as soon as it is done, the responses
+    # of failed imports are reported when the watch stops
+    def watch_resources(app: MoneyApp, args, resources: list[dict]) -> Response:
+        def write(message: str):
+            app.stdout.write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}\n")
+            app.stdout.flush()
+
+        response = Response(app)
+        watched = {}
+        for metadata in resources:
+            if NoteHelper.is_watchable(metadata, args.option):
+                watched[metadata[COLUMN_ID]] = URI.resolve(metadata["link"])[0]
+                continue
+            response.on("error").message(
+                "action",
+                style="warning",
+                action="WATCH",
+                what=TABLE_RESOURCE.human_name(),
+                argument="name",
+                value=metadata["name"],
+                reason="only local CSV and JSON Lines files can be watched",
+            )
+        if not watched:
+            return response
+
+        # notes read before are skipped by the resource cursor and hashes
+        args = copy.copy(args)
+        args.force = False
+        states, changed_at, pending_since = {}, {}, {}
+        write(f"Watching {len(watched)} resources, press Ctrl+C to stop")
+        try:
+            while watched:
+                now = time.monotonic()
+                for resource_id, path in list(watched.items()):
+                    state = NoteHelper.get_file_state(path)
+                    if state != states.get(resource_id, ()):
+                        states[resource_id] = state
+                        changed_at[resource_id] = now
+                        pending_since.setdefault(resource_id, now)
+                    if resource_id not in pending_since or state is None:
+                        continue
+                    # an unterminated last line is left to the next import, the
+                    # notes before it are imported anyway after WATCH_MAX_DELAY
+                    try:
+                        if now - pending_since[resource_id] < WATCH_MAX_DELAY and (
+                            now - changed_at[resource_id] < args.debounce
+                            or not NoteHelper.ends_with_newline(path)
+                        ):
+                            continue
+                    except OSError:
+                        continue
+                    del pending_since[resource_id]
+
+                    metadata = AppHelper.get_record_by_name_or_id(
+                        app.database[TABLE_RESOURCE.name], resource_id
+                    )
+                    if not metadata or metadata.get(COLUMN_DELETE):
+                        del watched[resource_id]
+                        continue
+                    # a rotated or deleted file is imported again once it changes
+                    summary = {}
+                    try:
+                        imported = NoteHelper.import_notes(
+                            app, args, metadata, summary=summary
+                        )
+                    except OSError as error:
+                        write(f"Resource [{metadata['name']}]: {error}")
+                        continue
+                    if summary.get("error"):
+                        response.concat(imported)
+                        write(
+                            f"Resource [{metadata['name']}]: importing failed,"
+                            " the errors are shown when the watch stops"
+                        )
+                    elif summary.get("read"):
+                        write(
+                            f"Resource [{metadata['name']}]: {summary['read']} notes"
+                            f" read, {summary['saved']} saved,"
+                            f" {summary['invalid']} invalid"
+                        )
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
+        return response.on("output").message(
+            "action", style="info", action="WATCH", what="notes", result="stopped"
+        )
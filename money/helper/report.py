@@ -1,9 +1,53 @@
+import json
 from datetime import datetime
 
+from cmdapp.database import Database
+
+from ..constants.schema import TABLE_REPORT
 from ..constants.var import REPORT_IN, REPORT_OUT, ANONYMOUS_NAME
 
 
 class ReportHelper:
+    # sorted ids as ranges of consecutive ids: [1, 2, 3, 5] -> "1-3,5"
+    def encode_ids(ids: list[int]) -> str:
+        ranges = []
+        for value in sorted(set(ids)):
+            if ranges and ranges[-1][1] == value - 1:
+                ranges[-1][1] = value
+            else:
+                ranges.append([value, value])
+        return ",".join(
+            [str(start) if start == end else f"{start}-{end}" for start, end in ranges]
+        )
+
+    # "1-3,5" -> [(1, 3), (5, 5)], the ids are filtered by range in the database
+    def decode_id_ranges(text: str) -> list[tuple[int, int]]:
+        ranges = []
+        for part in filter(None, (text or "").split(",")):
+            start, _, end = part.partition("-")
+            ranges.append((int(start), int(end or start)))
+        return ranges
+
+    # reports saved before `encode_ids` keep their ids as a JSON array
+    def migrate_report_ids(database: Database) -> bool:
+        reports = database.query(
+            f"SELECT id, txs FROM {TABLE_REPORT.name} WHERE substr(txs, 1, 1) = '['"
+        )
+        if not reports:
+            return True
+        rows = [
+            (ReportHelper.encode_ids(json.loads(report["txs"])), report["id"])
+            for report in reports
+        ]
+
+        sql = f"UPDATE {TABLE_REPORT.name} SET txs = ? WHERE id = ?"
+
+        def handler(conn):
+            conn.executemany(sql, rows)
+            return True
+
+        return database.with_transaction(handler=handler)
+
     def get_group_keys_parser(has_wallet: bool = True, has_account: bool = True):
         if not has_wallet:
             return lambda tx: (tx["payer"], tx["receiver"])
@@ -16,7 +60,7 @@ class ReportHelper:
 
     def group_by_categories_currency(transactions: list[dict], group_keys_parser):
         categories = {}
-        keys = set()
+        keys = {}
         for tx in transactions:
             amount = tx["amount"]
             category_data = categories.setdefault((tx["category"], tx["currency"]), {})
@@ -28,10 +72,30 @@ class ReportHelper:
             receiver_data = category_data.setdefault(
                 key_in, {REPORT_IN: 0.0, REPORT_OUT: 0.0}
             )
-            keys.update([key_in, key_out])
+            keys.update(dict.fromkeys([key_in, key_out]))
             receiver_data[REPORT_IN] += amount
         return categories, list(keys)
 
+    # same result as `group_by_categories_currency` from the sums of
+    # `AppHelper.aggregate_transactions` instead of each transaction
+    def group_aggregates(aggregates: list[dict], group_keys_parser):
+        categories = {}
+        keys = {}
+        for group in aggregates:
+            category_data = categories.setdefault(
+                (group["category"], group["currency"]), {}
+            )
+            wallet, account = group["wallet"], group["account"]
+            key_out, key_in = group_keys_parser(
+                dict(source=wallet, payer=account, destination=wallet, receiver=account)
+            )
+            direction = group["direction"]
+            key = key_in if direction == REPORT_IN else key_out
+            key_data = category_data.setdefault(key, {REPORT_IN: 0.0, REPORT_OUT: 0.0})
+            key_data[direction] += group["amount"]
+            keys.setdefault(key)
+        return categories, list(keys)
+
     def report_by_categories(
         transactions: list[dict],
         show_wallet: bool = True,
@@ -43,6 +107,28 @@ class ReportHelper:
         categories_data, group_keys = ReportHelper.group_by_categories_currency(
             transactions, group_keys_parser
         )
+        return ReportHelper.format_report(
+            categories_data, group_keys, show_wallet, show_account
+        )
+
+    def report_by_aggregates(
+        aggregates: list[dict],
+        show_wallet: bool = True,
+        show_account: bool = True,
+    ):
+        group_keys_parser = ReportHelper.get_group_keys_parser(
+            show_wallet, show_account
+        )
+        categories_data, group_keys = ReportHelper.group_aggregates(
+            aggregates, group_keys_parser
+        )
+        return ReportHelper.format_report(
+            categories_data, group_keys, show_wallet, show_account
+        )
+
+    def format_report(
+        categories_data: dict, group_keys: list, show_wallet: bool, show_account: bool
+    ):
         display_data = []
 
         multiple_key = isinstance(group_keys[0], tuple) if group_keys else False
@@ -0,0 +1,100 @@
+import hashlib
+import json
+
+from cmdapp.database import Database
+from cmdapp.parser import TableMeta
+
+SQL_TYPES = {"int": "INTEGER", "bool": "INTEGER", "float": "REAL", "str": "TEXT"}
+
+
+class SchemaHelper:
+    def execute(database: Database, statements: list[str]) -> bool:
+        if not statements:
+            return True
+
+        def handler(conn):
+            for statement in statements:
+                conn.execute(statement)
+            return True
+
+        return database.with_transaction(handler=handler)
+
+    def get_column_names(database: Database, table_name: str) -> list[str]:
+        columns = database.query(f"PRAGMA table_info({table_name})")
+        return [column["name"] for column in columns]
+
+    # tables are created by `Database.prepare`, but columns added to an existing
+    # table definition have to be added to the existing database as well
+    def add_missing_columns(database: Database, table_meta: TableMeta) -> bool:
+        existing_columns = SchemaHelper.get_column_names(database, table_meta.name)
+        if not existing_columns:
+            return True
+        statements = []
+        for column in table_meta.columns:
+            if column in existing_columns:
+                continue
+            sql_type = SQL_TYPES.get(table_meta[column].metadata.get("dtype"), "")
+            statements.append(
+                f"ALTER TABLE {table_meta.name} ADD COLUMN {column} {sql_type}".strip()
+            )
+        return SchemaHelper.execute(database, statements)
+
+    def get_index_sql(index: dict) -> str:
+        table_name = index["table"].name
+        columns = index["columns"]
+        where = index.get("where")
+        name = "_".join(["idx", table_name, *columns] + (["active"] if where else []))
+        unique = "UNIQUE " if index.get("unique") else ""
+        sql = f"CREATE {unique}INDEX IF NOT EXISTS {name}"
+        sql += f" ON {table_name} ({', '.join(columns)})"
+        return sql + (f" WHERE {where}" if where else "")
+
+    def create_indexes(database: Database, indexes: list[dict]) -> bool:
+        statements = [SchemaHelper.get_index_sql(index) for index in indexes]
+        return SchemaHelper.execute(database, statements)
+
+    def get_trigger_sql(trigger: dict) -> str:
+        statements = "".join(
+            [f"{statement.strip()};\n" for statement in trigger["statements"]]
+        )
+        sql = f"CREATE TRIGGER {trigger['name']}"
+        sql += f" {trigger['event']} ON {trigger['table'].name}"
+        return sql + f"\nBEGIN\n{statements}END"
+
+    # a trigger of an older definition is replaced
+    def create_triggers(database: Database, triggers: list[dict]) -> bool:
+        statements = []
+        for trigger in triggers:
+            statements.append(f"DROP TRIGGER IF EXISTS {trigger['name']}")
+            statements.append(SchemaHelper.get_trigger_sql(trigger))
+        return SchemaHelper.execute(database, statements)
+
+    def migrate(database: Database, schema: list[TableMeta]) -> bool:
+        return all(
+            [SchemaHelper.add_missing_columns(database, table) for table in schema]
+        )
+
+    # changes whenever a table, an index or a trigger definition changes
+    def get_fingerprint(
+        schema: list[TableMeta], indexes: list[dict], triggers: list[dict]
+    ) -> int:
+        tables = [
+            [
+                table.name,
+                {column: table[column].metadata for column in table.columns},
+                getattr(table, "constraints", None),
+            ]
+            for table in schema
+        ]
+        statements = [SchemaHelper.get_index_sql(index) for index in indexes]
+        statements += [SchemaHelper.get_trigger_sql(trigger) for trigger in triggers]
+        content = json.dumps([tables, statements], sort_keys=True, default=str)
+        # `PRAGMA user_version` holds a signed 32-bit integer, 0 for new databases
+        return int(hashlib.sha1(content.encode("utf-8")).hexdigest()[:7], 16) + 1
+
+    def get_user_version(database: Database) -> int:
+        result = database.query("PRAGMA user_version")
+        return result[0]["user_version"] if result else 0
+
+    def set_user_version(database: Database, version: int) -> bool:
+        return SchemaHelper.execute(database, [f"PRAGMA user_version = {int(version)}"])
@@ -0,0 +1,85 @@
+import pickle
+
+from ..notes import LocalParser
+from .alias import AliasMap
+
+
+# the state of a process parsing notes for a parallel import, created by the
+# pool initializer with the alias map of the import
+class NoteWorker:
+    def __init__(self, aliases: AliasMap):
+        self.aliases = aliases
+
+    # errors are sent back to the importing process, so they must be picklable
+    @staticmethod
+    def get_portable_error(error: Exception) -> Exception:
+        try:
+            pickle.loads(pickle.dumps(error))
+            return error
+        except Exception:
+            return ValueError(str(error))
+
+    def parse_notes(self, chunk: list[dict], start: int, options: dict):
+        from .note import NoteHelper
+
+        sanitized_data, error_with_indices = NoteHelper.parse_notes(
+            self.aliases, chunk, start=start, **options
+        )
+        # notes with the same invalid value share their error
+        portable_errors = {}
+        for index, error in error_with_indices:
+            if id(error) not in portable_errors:
+                portable_errors[id(error)] = NoteWorker.get_portable_error(error)
+        error_with_indices = [
+            (index, portable_errors[id(error)]) for index, error in error_with_indices
+        ]
+        return sanitized_data, error_with_indices, self.aliases.take_unknown()
+
+    # read and parse the notes of a byte range of a local file. Every note is
+    # parsed, the importing process only keeps the results of the new ones, so
+    # the unknown names are also counted note by note
+    def parse_range(self, path: str, format: str, start: int, end: int, options):
+        from .note import NoteHelper
+
+        position = {"offset": start}
+        notes = list(LocalParser.iterate(path, format, position, end))
+        digests = [NoteHelper.digest_note(note) for note in notes]
+        data, errors, unknown = [], [], {}
+        for index, note in enumerate(notes):
+            sanitized_data, error_with_indices = NoteHelper.parse_notes(
+                self.aliases, [note], start=index, **options
+            )
+            data.extend((index, item) for item in sanitized_data)
+            errors.extend(
+                (index, note, NoteWorker.get_portable_error(error))
+                for index, error in error_with_indices
+            )
+            note_unknown = self.aliases.take_unknown()
+            if any(note_unknown.values()):
+                unknown[index] = note_unknown
+        return dict(
+            count=len(notes),
+            last=notes[-1] if notes else None,
+            digests=digests,
+            end=position["offset"],
+            data=data,
+            errors=errors,
+            unknown=unknown,
+        )
+
+
+# only set in the worker processes
+worker: NoteWorker = None
+
+
+def init_worker(aliases: AliasMap):
+    global worker
+    worker = NoteWorker(aliases)
+
+
+def parse_notes_in_worker(chunk: list[dict], start: int, options: dict):
+    return worker.parse_notes(chunk, start, options)
+
+
+def parse_range_in_worker(path: str, format: str, start: int, end: int, options):
+    return worker.parse_range(path, format, start, end, options)
@@ -19,47 +19,86 @@ def prepare_database(path: str):
         )
         from .constants.schema import DATABASE_SCHEMA
 
+    from .constants.index import DATABASE_INDEXES
+    from .constants.trigger import DATABASE_TRIGGERS
+    from .helper.schema import SchemaHelper
+    from .helper.balance import BalanceHelper
+    from .helper.report import ReportHelper
+
     database = Database(path, DATABASE_SCHEMA)
-    good = database.prepare()
+    # the database was prepared with the same definitions on a previous launch
+    fingerprint = SchemaHelper.get_fingerprint(
+        DATABASE_SCHEMA, DATABASE_INDEXES, DATABASE_TRIGGERS
+    )
+    if SchemaHelper.get_user_version(database) == fingerprint:
+        return database, True
+    good = (
+        database.prepare()
+        and SchemaHelper.migrate(database, DATABASE_SCHEMA)
+        and SchemaHelper.create_indexes(database, DATABASE_INDEXES)
+        and SchemaHelper.create_triggers(database, DATABASE_TRIGGERS)
+        and BalanceHelper.prepare(database)
+        and ReportHelper.migrate_report_ids(database)
+        and SchemaHelper.set_user_version(database, fingerprint)
+    )
     return database, good
 
 
 import os
+import sys
 from .constants.var import ENV_DATABASE_PATH, ENV_CONFIG_PATH
 
 DATABASE_FILE_PATH = os.environ.get(ENV_DATABASE_PATH, "money.db")
 CONFIG_PATH = os.environ.get(ENV_CONFIG_PATH, "money.conf")
 
-database, good = prepare_database(DATABASE_FILE_PATH)
 
-if not good:
-    errors = database.get_errors()
-    print(
-        "Failed to initialize the database. Check the SQLite syntax!\n"
-        + "\n".join(
-            [
-                f"[{error['table']}] ERROR [{error['type']}] '{error['message']}' on executing\n{error['sql']}"
-                for error in errors
-            ]
+def main():
+    # `serve` keeps the app running and takes the commands from a local socket
+    serving = sys.argv[1:2] == ["serve"]
+    if serving:
+        del sys.argv[1:2]
+    database, good = prepare_database(DATABASE_FILE_PATH)
+
+    if not good:
+        errors = database.get_errors()
+        print(
+            "Failed to initialize the database. Check the SQLite syntax!\n"
+            + "\n".join(
+                [
+                    f"[{error['table']}] ERROR [{error['type']}] '{error['message']}' on executing\n{error['sql']}"
+                    for error in errors
+                ]
+            )
         )
-    )
-else:
-    from .prototype import *
-    from .app import MoneyApp
-    from .constants.template import RESPONSE_FORMATTER
+    else:
+        from .prototype import (
+            NotePrototype,
+            ReportPrototype,
+            EventPrototype,
+            LiquidityPrototype,
+        )
+        from .app import MoneyApp
+        from .constants.template import RESPONSE_FORMATTER
 
-    start_app(
-        app_prototypes=[
-            BasePrototype(database, category="Database Commands"),
-            NotePrototype(category="Expense Commands"),
-            ReportPrototype(category="Expense Commands"),
-            EventPrototype(category="Expense Commands"),
-            LiquidityPrototype(category="Expense Commands"),
-        ],
-        app_class=MoneyApp,
-        builtin_command_category="Builtin Commands",
-        app_name="Money",
-        database=database,
-        response_formatter=RESPONSE_FORMATTER,
-        config_path=CONFIG_PATH,
-    )
+        if serving:
+            from .server import MoneyServerApp
+
+        start_app(
+            app_prototypes=[
+                BasePrototype(database, category="Database Commands"),
+                NotePrototype(category="Expense Commands"),
+                ReportPrototype(category="Expense Commands"),
+                EventPrototype(category="Expense Commands"),
+                LiquidityPrototype(category="Expense Commands"),
+            ],
+            app_class=MoneyServerApp if serving else MoneyApp,
+            builtin_command_category="Builtin Commands",
+            app_name="Money",
+            database=database,
+            response_formatter=RESPONSE_FORMATTER,
+            config_path=CONFIG_PATH,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
 from .parser import NotesParser
-from .notesnook import NotesnookParser
+from .notesnook import NotesnookParser, HTML_PARSER_STREAM, HTML_PARSER_SOUP
 from .local import LocalParser
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+KEY_CACHE_SIZE = 64
+
+
+class KeyCache:
+    # derived keys are kept in least recently used order, optionally mirrored in a
+    # file that only the current user can read (anyone reading it can decrypt notes)
+    def __init__(self, max_size: int = KEY_CACHE_SIZE, path: str = None):
+        self.max_size = max(int(max_size), 1)
+        self.path = path
+        self.keys: OrderedDict[str, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_cache_key(password: bytes, salt: bytes, parameters: dict) -> str:
+        password_digest = hashlib.sha256(password).hexdigest()
+        return ":".join(
+            [password_digest, salt.hex(), json.dumps(parameters, sort_keys=True)]
+        )
+
+    def load(self):
+        self.loaded = True
+        if not (self.path and os.path.isfile(self.path)):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return
+        for cache_key, key in list(stored.items())[-self.max_size :]:
+            self.keys[cache_key] = bytes.fromhex(key)
+
+    def store(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump({k: v.hex() for k, v in self.keys.items()}, file)
+        os.replace(temp_path, self.path)
+
+    def get(self, cache_key: str) -> bytes | None:
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            key = self.keys.get(cache_key)
+            if key is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.keys.move_to_end(cache_key)
+            return key
+
+    def set(self, cache_key: str, key: bytes):
+        with self.lock:
+            self.keys[cache_key] = key
+            self.keys.move_to_end(cache_key)
+            while len(self.keys) > self.max_size:
+                self.keys.popitem(last=False)
+            try:
+                self.store()
+            except OSError:
+                pass
@@ -1,23 +1,166 @@
 import csv
 import json
+import hashlib
+import re
 from pathlib import Path
 
-import yaml
 from .parser import NotesParser
 
 
+JSON_READ_SIZE = 64 * 1024
+RANGE_READ_SIZE = 1024 * 1024
+JSON_SPACE_REGEX = re.compile(r"[ \t\n\r]*")
+
+# formats that are read line by line, so reading can resume at a byte offset
+RESUMABLE_FORMATS = [".csv", ".jsonl"]
+HEAD_FINGERPRINT_SIZE = 1024
+
+
 class LocalParser(NotesParser):
-    def parse(file_path: str, format: str = None) -> list:
+    def get_format(file_path: str, format: str = None) -> str:
         if format and not format.startswith("."):
             format = "." + format
-        extension = format or Path(file_path).suffix
+        return format or Path(file_path).suffix
+
+    def is_resumable(file_path: str, format: str = None) -> bool:
+        return LocalParser.get_format(file_path, format) in RESUMABLE_FORMATS
+
+    def fingerprint(file_path: str, length: int) -> str:
+        with open(file_path, "rb") as file:
+            head = file.read(min(length, HEAD_FINGERPRINT_SIZE))
+        return hashlib.sha1(head).hexdigest()
+
+    def parse(file_path: str, format: str = None) -> list:
+        return list(LocalParser.iterate(file_path, format))
+
+    def iterate(
+        file_path: str, format: str = None, position: dict = None, end: int = None
+    ):
+        extension = LocalParser.get_format(file_path, format)
+        if extension in RESUMABLE_FORMATS:
+            yield from LocalParser.iterate_lines(file_path, extension, position, end)
+            return
         with open(file_path, "r", encoding="utf-8") as file:
-            data = []
-            if extension == ".csv":
-                data = list(csv.DictReader(file))
-            elif extension == ".json":
-                data = json.load(file)
+            if extension == ".json":
+                yield from LocalParser.iterate_json_array(file)
             elif extension in [".yaml", ".yml"]:
-                data = yaml.safe_load(file)
+                import yaml
+
+                for document in yaml.safe_load_all(file):
+                    if isinstance(document, list):
+                        yield from document
+                    elif document is not None:
+                        yield document
+
+    def read_lines(
+        file, position: dict, complete_only: bool = False, end: int = None
+    ):
+        for line in file:
+            if end is not None and position["offset"] >= end:
+                return
+            # a last line without line break may still be written,
+            # the reading stops before it and takes it once it is complete
+            if complete_only and not line.endswith(b"\n"):
+                return
+            position["offset"] += len(line)
+            yield line.decode("utf-8")
+
+    # `position["offset"]` is the byte offset to start reading at (after the
+    # header for CSV), it is moved past each note right before it is yielded.
+    # Reading with a position only yields the notes of complete lines, the notes
+    # starting before `end`
+    def iterate_lines(
+        file_path: str, extension: str, position: dict = None, end: int = None
+    ):
+        complete_only = position is not None
+        position = {} if position is None else position
+        offset = position.get("offset") or 0
+        position["offset"] = 0
+        with open(file_path, "rb") as file:
+            lines = LocalParser.read_lines(file, position, complete_only, end)
+            if extension == ".jsonl":
+                if offset:
+                    file.seek(offset)
+                    position["offset"] = offset
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+            if not offset:
+                yield from csv.DictReader(lines)
+                return
+            header = next(csv.reader(lines), None)
+            if offset > position["offset"]:
+                file.seek(offset)
+                position["offset"] = offset
+            yield from csv.DictReader(lines, fieldnames=header)
+
+    # cut the lines from `offset` into ranges of about `range_size` bytes, at line
+    # breaks outside of quoted CSV cells. The last range ends with the file
+    def split_ranges(
+        file_path: str, format: str = None, offset: int = 0, range_size: int = 1
+    ):
+        count_quotes = LocalParser.get_format(file_path, format) == ".csv"
+        start, quoted = offset, False
+        with open(file_path, "rb") as file:
+            file.seek(offset)
+            block_offset = offset
+            while block := file.read(RANGE_READ_SIZE):
+                counted, index = 0, start + range_size - block_offset
+                while (index := block.find(b"\n", max(index, 0))) >= 0:
+                    if count_quotes:
+                        quoted ^= block.count(b'"', counted, index) % 2 == 1
+                        counted = index
+                    index += 1
+                    if not quoted:
+                        yield start, block_offset + index
+                        start = block_offset + index
+                        index = start + range_size - block_offset
+                if count_quotes:
+                    quoted ^= block.count(b'"', counted) % 2 == 1
+                block_offset += len(block)
+        yield start, None
 
-        return data
+    # items are separated by exactly one comma, and only spaces follow the array
+    def iterate_json_array(file):
+        decoder = json.JSONDecoder()
+        buffer = file.read(JSON_READ_SIZE).lstrip()
+        if not buffer.startswith("["):
+            data = json.loads(buffer + file.read())
+            yield from data if isinstance(data, list) else [data]
+            return
+        position, eof, expected = 1, False, "first"
+        while True:
+            position = JSON_SPACE_REGEX.match(buffer, position).end()
+            char = buffer[position : position + 1]
+            if not char:
+                if eof:
+                    raise json.JSONDecodeError("Unterminated array", buffer, position)
+            elif char == "]" and expected != "item":
+                break
+            elif expected == "separator":
+                if char != ",":
+                    raise json.JSONDecodeError(
+                        "Expecting ',' delimiter", buffer, position
+                    )
+                position, expected = position + 1, "item"
+                continue
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    # a value that ends the buffer may be cut (like numbers), read more
+                    if end < len(buffer) or eof:
+                        yield item
+                        position, expected = end, "separator"
+                        continue
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+            chunk = file.read(JSON_READ_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+        rest = buffer[position + 1 :] + file.read()
+        position = JSON_SPACE_REGEX.match(rest).end()
+        if position < len(rest):
+            raise json.JSONDecodeError("Extra data", rest, position)
@@ -1,15 +1,30 @@
-from bs4 import BeautifulSoup
-from Crypto.Cipher import ChaCha20_Poly1305
 from base64 import urlsafe_b64decode
-import argon2
 import json
+import os
 import re
-import requests
 from .parser import NotesParser
+from .table import iterate_tables
+from .keycache import KeyCache
+from .pagecache import PageCache
+from ..constants.var import ENV_KEY_CACHE_PATH, ENV_PAGE_CACHE_PATH
 
 
 AEAD_XCHACHA20POLY1305_IETF_KEYLEN = 32
+REQUEST_TIMEOUT = 30
+HTML_PARSER_STREAM = "stream"
+HTML_PARSER_SOUP = "bs4"
 ENCRYPTED_CONTENT_REGEX = r'(?<="encryptedContent":){[\s\S]*?}(?=,"datePublished")'
+ARGON2_PARAMETERS = dict(
+    time_cost=3,
+    memory_cost=8 * 1024,
+    parallelism=1,
+    hash_len=AEAD_XCHACHA20POLY1305_IETF_KEYLEN,
+)
+
+# crypto and http libraries are imported on first use, so commands that do not
+# fetch remote notes start without loading them
+KEY_CACHE = KeyCache(path=os.environ.get(ENV_KEY_CACHE_PATH))
+PAGE_CACHE = PageCache(os.environ.get(ENV_PAGE_CACHE_PATH))
 
 
 class Decryptor:
@@ -24,6 +39,19 @@ class Decryptor:
         key = splits[1]
         return Decryptor.b64_decode(key) if key else None
 
+    def derive_key(password: bytes, salt: bytes) -> bytes:
+        # the key derivation is slow by design, reuse keys for unchanged password and salt
+        cache_key = KeyCache.get_cache_key(password, salt, ARGON2_PARAMETERS)
+        key = KEY_CACHE.get(cache_key)
+        if key is None:
+            import argon2
+
+            key = argon2.low_level.hash_secret_raw(
+                secret=password, salt=salt, type=argon2.Type.I, **ARGON2_PARAMETERS
+            )
+            KEY_CACHE.set(cache_key, key)
+        return key
+
     # https://github.com/streetwriters/notesnook/blob/master/apps/monograph/app/components/monographpost/index.tsx#L689
     def decrypt(
         password: bytes,
@@ -39,15 +67,9 @@ class Decryptor:
         ciphertext = Decryptor.b64_decode(cipher)
         salt = Decryptor.b64_decode(salt)
 
-        key = argon2.low_level.hash_secret_raw(
-            secret=password,
-            salt=salt,
-            time_cost=3,
-            memory_cost=8 * 1024,
-            parallelism=1,
-            hash_len=AEAD_XCHACHA20POLY1305_IETF_KEYLEN,
-            type=argon2.Type.I,
-        )
+        key = Decryptor.derive_key(password, salt)
+
+        from Crypto.Cipher import ChaCha20_Poly1305
 
         # XChaCha20_Poly1305 is 24-bytes Nonce version
         cipher = ChaCha20_Poly1305.new(key=key, nonce=iv)
@@ -68,17 +90,64 @@ class NotesnookParser(NotesParser):
             return {}
         return json.loads(match.group())
 
-    def parse(monograph_url: str) -> list:
-        response = requests.get(monograph_url)
-        if not response.status_code == 200:
-            raise RuntimeError("Fail to get Notesnook note")
+    def create_session(pool_size: int = 10) -> "requests.Session":
+        import requests
+
+        session = requests.Session()
+        # keep one alive connection per concurrent fetch
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def parse(
+        monograph_url: str,
+        session: "requests.Session" = None,
+        timeout=REQUEST_TIMEOUT,
+        only_modified: bool = False,
+        html_parser: str = HTML_PARSER_STREAM,
+    ) -> list:
+        import requests
+
+        client = session or requests
+        headers = PAGE_CACHE.get_headers(monograph_url)
+        response = client.get(monograph_url, headers=headers, timeout=timeout)
+        page = None
+        if response.status_code == 304:
+            # the page did not change since last fetching, so there are no new notes
+            if only_modified:
+                return []
+            page = PAGE_CACHE.get_body(monograph_url)
+            if page is None:
+                response = client.get(monograph_url, timeout=timeout)
+        if page is None:
+            if not response.status_code == 200:
+                raise RuntimeError("Fail to get Notesnook note")
+            page = response.text
+
+        data = NotesnookParser.parse_page(page, monograph_url, html_parser)
+        if response.status_code == 200:
+            PAGE_CACHE.stage(monograph_url, response.headers, page)
+        return data
+
+    # the staged page is written after its notes are saved, or dropped
+    def release_page(monograph_url: str, saved: bool):
+        if saved:
+            PAGE_CACHE.commit(monograph_url)
+        else:
+            PAGE_CACHE.discard(monograph_url)
 
-        encrypted_data = NotesnookParser.get_encrypted_data(response.text)
+    def parse_page(
+        page: str, monograph_url: str, html_parser: str = HTML_PARSER_STREAM
+    ) -> list:
+        encrypted_data = NotesnookParser.get_encrypted_data(page)
         password = Decryptor.get_password_from_url(monograph_url)
         if encrypted_data and not password:
             raise RuntimeError("Require password to parse Notesnook note")
         if not encrypted_data:
-            text = response.text
+            text = page
         else:
             try:
                 text = Decryptor.decrypt(password=password, **encrypted_data)
@@ -89,6 +158,13 @@ class NotesnookParser(NotesParser):
         if not text:
             raise RuntimeError("Fail to parse Notesnook note")
 
+        if html_parser == HTML_PARSER_SOUP:
+            return NotesnookParser.parse_soup(text)
+        return list(iterate_tables(text))
+
+    def parse_soup(text: str) -> list:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(text, "html.parser")
 
         tables = soup.find_all("table")
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urldefrag
+
+PAGE_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class PageCache:
+    # pages are stored with their validators (ETag, Last-Modified) so next fetches
+    # are conditional requests, least recently used pages are evicted over the cap
+    def __init__(self, directory: str = None, max_size: int = PAGE_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        # fetched pages are only written once their notes are saved, otherwise a
+        # failed import would be skipped as unchanged on the next one
+        self.pending: dict[str, tuple[dict, str]] = {}
+
+    def get_paths(self, url: str) -> tuple[str, str]:
+        # the fragment holds the note password and is never sent to the server
+        name = hashlib.sha1(urldefrag(url).url.encode("utf-8")).hexdigest()
+        path = os.path.join(self.directory, name)
+        return f"{path}.json", f"{path}.html"
+
+    def get_headers(self, url: str) -> dict:
+        if not self.directory:
+            return {}
+        meta_path, body_path = self.get_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not os.path.isfile(body_path):
+            return {}
+        try:
+            os.utime(meta_path)
+        except OSError:
+            # evicted by another import meanwhile
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def get_body(self, url: str) -> str | None:
+        if not self.directory:
+            return None
+        _, body_path = self.get_paths(url)
+        try:
+            with open(body_path, "r", encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def stage(self, url: str, headers: dict, body: str):
+        if self.directory:
+            with self.lock:
+                self.pending[urldefrag(url).url] = (headers, body)
+
+    def commit(self, url: str):
+        with self.lock:
+            staged = self.pending.pop(urldefrag(url).url, None)
+        if staged:
+            self.set(url, *staged)
+
+    def discard(self, url: str):
+        with self.lock:
+            self.pending.pop(urldefrag(url).url, None)
+
+    def set(self, url: str, headers: dict, body: str):
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not (self.directory and (etag or last_modified)):
+            return
+        meta_path, body_path = self.get_paths(url)
+        with self.lock:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            with open(body_path, "w", encoding="utf-8") as file:
+                file.write(body)
+            with open(meta_path, "w", encoding="utf-8") as file:
+                json.dump(dict(etag=etag, last_modified=last_modified), file)
+            self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[: -len(".json")] + ".html"
+            size = os.path.getsize(meta_path)
+            if os.path.isfile(body_path):
+                size += os.path.getsize(body_path)
+            entries.append((os.path.getmtime(meta_path), size, meta_path, body_path))
+        total_size = sum(entry[1] for entry in entries)
+        for _, size, meta_path, body_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            for path in [meta_path, body_path]:
+                if os.path.isfile(path):
+                    os.remove(path)
+            total_size -= size
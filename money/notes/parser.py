@@ -22,8 +22,11 @@ class NotesParser:
 
         return table_data
 
-    def find_new(records: list[dict], last_value: dict):
+    def find_index(records, last_value: dict) -> int:
         for index, record in enumerate(records):
             if all(record.get(k) == v for k, v in last_value.items()):
-                return records[index + 1 :]
-        return records
+                return index
+        return -1
+
+    def find_new(records: list[dict], last_value: dict):
+        return records[NotesParser.find_index(records, last_value) + 1 :]
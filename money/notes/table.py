@@ -0,0 +1,110 @@
+from html.parser import HTMLParser
+
+TABLE_READ_SIZE = 64 * 1024
+
+
+class TableExtractor(HTMLParser):
+    # build rows from parsing events instead of a document tree, with the same
+    # header and cell semantics as `NotesParser.parse_table`
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: list[dict] = []
+        self.table_depth = 0
+        self.skip_depth = 0
+        # the parser may split the text of one node into many `handle_data` calls
+        self.text: list[str] = []
+        self.reset_table()
+
+    def reset_table(self):
+        self.headers = None
+        self.header_cells = []
+        self.row = None
+        self.cell = None
+
+    def pop_rows(self) -> list[dict]:
+        rows, self.rows = self.rows, []
+        return rows
+
+    def handle_starttag(self, tag, attrs):
+        self.end_text()
+        if tag in ("script", "style"):
+            self.skip_depth += 1
+        elif tag == "table":
+            self.table_depth += 1
+            if self.table_depth == 1:
+                self.reset_table()
+        elif self.table_depth != 1:
+            return
+        elif tag == "tr":
+            self.end_row()
+            self.row = {"strings": [], "cells": []}
+        elif tag in ("td", "th") and self.row is not None:
+            self.end_cell()
+            self.cell = {"tag": tag, "strings": []}
+
+    def handle_endtag(self, tag):
+        self.end_text()
+        if tag in ("script", "style"):
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag == "table":
+            if self.table_depth == 1:
+                self.end_row()
+            self.table_depth = max(self.table_depth - 1, 0)
+        elif self.table_depth != 1:
+            return
+        elif tag == "tr":
+            self.end_row()
+        elif tag in ("td", "th"):
+            self.end_cell()
+
+    def handle_data(self, data):
+        if not self.table_depth or self.skip_depth or self.row is None:
+            return
+        self.text.append(data)
+
+    def end_text(self):
+        text, self.text = "".join(self.text).strip(), []
+        if not text:
+            return
+        self.row["strings"].append(text)
+        if self.cell is not None:
+            self.cell["strings"].append(text)
+
+    def end_cell(self):
+        if self.cell is None:
+            return
+        if self.cell["tag"] == "th":
+            self.header_cells.append("".join(self.cell["strings"]))
+        self.row["cells"].append(self.cell)
+        self.cell = None
+
+    def end_row(self):
+        self.end_cell()
+        row, self.row = self.row, None
+        if row is None:
+            return
+        # the first row is the header row, unless the table has header cells
+        if self.headers is None:
+            headers = self.header_cells or [
+                "".join(cell["strings"]) for cell in row["cells"]
+            ]
+            self.headers = [header for header in headers if header]
+            return
+        if not row["strings"]:
+            return
+        cells_text = [
+            "\n".join(cell["strings"]) or None
+            for cell in row["cells"]
+            if cell["tag"] == "td"
+        ]
+        self.rows.append(dict(zip(self.headers, cells_text)))
+
+
+def iterate_tables(text: str):
+    extractor = TableExtractor()
+    for start in range(0, len(text), TABLE_READ_SIZE):
+        extractor.feed(text[start : start + TABLE_READ_SIZE])
+        yield from extractor.pop_rows()
+    extractor.close()
+    extractor.end_text()
+    yield from extractor.pop_rows()
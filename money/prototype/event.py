@@ -1,9 +1,9 @@
 from cmdapp.core import Prototype, Response, as_command
 
 from ..constants.schema import *
-from ..constants.var import CONFIG_EVENT_FIELDNAMES
+from ..constants.var import CONFIG_EVENT_FIELDNAMES, EXPORT_PAGE_SIZE
 
-from ..helper import AppHelper, EventHelper
+from ..helper import AppHelper, EventHelper, ExportHelper
 from ..app import MoneyApp
 
 
@@ -19,7 +19,7 @@ class EventPrototype(Prototype):
             "rates": "[currency=rate] r (json[float]): conversion rates from other currencies to chosen currency.\nExample: `usd=23500` means convert 1 usd to 23500 chosen currency",
             "name": "n (str[telex]): name (title) of the report",
             "export": "[file] p (str): save sharing transactions into invoice file",
-            "format": "f (str = html): invoice file format",
+            "format": "f (str = html): invoice file format.\n`csv` and `jsonl` files are written while the transactions are read, other formats like `html` are not streamed: they are rendered by the app formatter from all the transactions at once",
             "rename": "[name=new_name] q (json[str]): rename invoice fields. The orders are important",
             "ignore": "(bool = 0): set to ignore transactions with unexpected currencies\n(not provide conversion rates), otherwise raise error",
             "save": "(bool = 0): set to create event for this summarization",
@@ -99,18 +99,31 @@ class EventPrototype(Prototype):
         # export invoices
         if not args.export:
             return response
-        invoices = EventHelper.get_sharing_invoices(app, event_attributes["sharings"])
 
         fieldnames = app.config.get(CONFIG_EVENT_FIELDNAMES) or dict(args.rename or {})
+        export_options = dict(
+            title=f"{event_name} Invoices",
+            description=event_tag["description"],
+            rename=fieldnames,
+            what="invoices",
+        )
+        if ExportHelper.is_streamable(args.format):
+            invoices = AppHelper.iterate_sharing_invoices(
+                app, event_attributes["sharings"], EXPORT_PAGE_SIZE
+            )
+            return response.concat(
+                ExportHelper.export_rows(
+                    app,
+                    invoices,
+                    args.export,
+                    args.format,
+                    mapper=EventHelper.get_invoice_mapper(app),
+                    **export_options,
+                )
+            )
+        invoices = EventHelper.get_sharing_invoices(app, event_attributes["sharings"])
         return response.concat(
             AppHelper.export_to_file(
-                app,
-                invoices,
-                args.export,
-                args.format,
-                title=f"{event_name} Invoices",
-                description=event_tag["description"],
-                rename=fieldnames,
-                what="invoices",
+                app, invoices, args.export, args.format, **export_options
             )
         )
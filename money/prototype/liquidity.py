@@ -1,11 +1,14 @@
+from datetime import datetime
+
 from cmdapp.core import Prototype, Response, as_command
-from cmdapp.parser import COLUMN_ID
+from cmdapp.parser import COLUMN_ID, COLUMN_DELETE
 from cmdapp.utils import Hash
 
 from ..constants.var import *
 from ..constants.schema import *
 
-from ..helper import AppHelper
+from ..helper import AppHelper, BalanceHelper
+from ..notes import LocalParser
 from ..app import MoneyApp
 
 
@@ -13,18 +16,159 @@ def show_datetime(value):
     return value.strftime(DISPLAY_DATETIME_FORMAT)
 
 
+def get_difference_status(difference: float) -> dict:
+    if difference < -1e-6:
+        return {"style": "error", "message": "LEAK"}
+    if difference > 1e-6:
+        return {"style": "success", "message": "REDUNDANT"}
+    return {"style": None, "message": "NO DIFFERENCE"}
+
+
+def read_actual_balances(app: MoneyApp, file_path: str):
+    wallets = app.database.query(f"SELECT {COLUMN_ID}, name FROM {TABLE_WALLET.name}")
+    wallet_ids = {wallet["name"]: wallet[COLUMN_ID] for wallet in wallets}
+    wallet_ids |= {str(wallet[COLUMN_ID]): wallet[COLUMN_ID] for wallet in wallets}
+    balances, invalid = {}, []
+    for index, row in enumerate(LocalParser.iterate(file_path)):
+        wallet_id = wallet_ids.get(str(row.get("wallet", "")).strip())
+        currency = str(row.get("currency") or "").strip()
+        try:
+            balance = float(str(row.get("balance")).replace(",", ""))
+        except ValueError:
+            balance = None
+        if wallet_id is None or not currency or balance is None:
+            invalid.append(index)
+            continue
+        balances[(wallet_id, currency)] = balance
+    return balances, invalid
+
+
+def check_all_wallets(app: MoneyApp, args) -> Response:
+    response = Response(app)
+    timestamp = args.timestamp.replace(microsecond=0)
+    actual_balances, invalid_rows = {}, []
+    if args.balances:
+        try:
+            actual_balances, invalid_rows = read_actual_balances(app, args.balances)
+        except Exception as error:
+            return response.on("error").message(
+                "exception", style="error", message=error
+            )
+    if invalid_rows:
+        response.message(
+            "found",
+            style="warning",
+            count=len(invalid_rows),
+            what="invalid balances",
+            inside=args.balances,
+            field="index",
+            items=invalid_rows,
+            result="They are ignored",
+        )
+
+    groups = {
+        (group["wallet"], group["currency"]): group
+        for group in AppHelper.get_balances_since_last_liquidity(app, timestamp)
+    }
+    for key in actual_balances:
+        groups.setdefault(
+            key,
+            dict(wallet=key[0], currency=key[1], delta=0, count=0, last_balance=None),
+        )
+    wallets = app.database.query(f"SELECT {COLUMN_ID}, name FROM {TABLE_WALLET.name}")
+    wallet_names = {wallet[COLUMN_ID]: wallet["name"] for wallet in wallets}
+
+    rows, liquidities = [], []
+    for key in sorted(groups, key=lambda key: (wallet_names.get(key[0], ""), key[1])):
+        group = groups[key]
+        last_balance = group["last_balance"]
+        calculated_balance = (last_balance or 0) + (group["delta"] or 0)
+        row = {
+            "wallet": wallet_names.get(group["wallet"], group["wallet"]),
+            "currency": group["currency"],
+            "previous": "" if last_balance is None else f"{last_balance:,.0f}",
+            "transactions": group["count"],
+            "calculated": f"{calculated_balance:,.0f}",
+            "actual": "",
+            "difference": "",
+        }
+        rows.append(row)
+        current_balance = actual_balances.get(key)
+        if current_balance is None:
+            continue
+        difference = current_balance - calculated_balance
+        row["actual"] = f"{current_balance:,.0f}"
+        row["difference"] = (
+            f"{get_difference_status(difference)['message']}: {abs(difference):,.0f}"
+        )
+        # no more transactions and no changes in provided current balance
+        if not group["count"] and last_balance == current_balance:
+            continue
+        liquidities.append(
+            dict(
+                wallet=group["wallet"],
+                currency=group["currency"],
+                balance=float(current_balance),
+                calculate=float(calculated_balance),
+                timestamp=timestamp,
+            )
+        )
+
+    response.message(
+        None,
+        f"Balances calculated from transactions happened before [{show_datetime(timestamp)}]:",
+        style="info",
+    ).table(rows, style="bordered")
+    if not actual_balances:
+        return response.message(
+            "argument",
+            style="warning",
+            argument="balances",
+            status="missing",
+            result="The liquidities can not be saved into database",
+        )
+    if not liquidities:
+        return response.message(
+            None, "No changes since last saved liquidities\n", style="info"
+        )
+    if not AppHelper.save_records(app, TABLE_LIQUIDITY, liquidities):
+        return response.on("error").message(
+            "action", style="error", action="CREATE", what=TABLE_LIQUIDITY.human_name(2)
+        ).concat(AppHelper.get_database_errors(app))
+    return response.message(
+        "action",
+        style="success",
+        action="CREATE",
+        what=TABLE_LIQUIDITY.human_name(len(liquidities)),
+        argument="count",
+        value=len(liquidities),
+    )
+
+
 class LiquidityPrototype(Prototype):
     @as_command(
         description="Update the wallet balance and check the difference with balance from transactions",
         epilog="This command should be used to set current (real) balance of a wallet and summarize the balance calculated from saved transactions, then notify the difference",
         arguments={
-            "wallet": "* (*str): wallet to check the balance",
+            "wallet": "* (str): wallet to check the balance. required without `--all`",
             "timestamp": "t, at (*datetime): timestamp to check",
             "balance": "v, value (float): actual current balance of the wallet",
             "currency": "c (str): currency unit. require to save into database",
+            "all": "a (bool = 0): check every wallet and currency in one pass",
+            "balances": "[file] b (str): file of actual balances with `wallet`, `currency` and `balance` fields for `--all`. require to save into database",
         },
     )
     def do_check(app: MoneyApp, args):
+        if args.all:
+            return check_all_wallets(app, args)
+        if not args.wallet:
+            return Response(app).on("error").message(
+                "argument",
+                style="error",
+                argument="wallet",
+                status="missing",
+                result="Use `--all` to check all wallets",
+            )
         currency = args.currency
         current_balance = args.balance
         timestamp = args.timestamp.replace(microsecond=0)
@@ -130,11 +274,7 @@ class LiquidityPrototype(Prototype):
             style="info",
         )
         difference = current_balance - calculated_balance
-        message_kwargs = {"style": None, "message": "NO DIFFERENCE"}
-        if difference < -1e-6:
-            message_kwargs = {"style": "error", "message": "LEAK"}
-        elif difference > 1e-6:
-            message_kwargs = {"style": "success", "message": "REDUNDANT"}
+        message_kwargs = get_difference_status(difference)
         response.message(
             None,
             f"==> {message_kwargs['message']}: {abs(difference):,.0f} {currency}\n",
@@ -154,3 +294,208 @@ class LiquidityPrototype(Prototype):
                 ),
             )
         )
+
+    @as_command(
+        description="Verify the daily wallet balances against saved transactions",
+        epilog="Daily balances are updated with every change of transactions and used to calculate balances in `check` command. Use `--rebuild` to summarize them again from all saved transactions",
+        arguments={
+            "rebuild": "(bool = 0): rebuild daily balances from all saved transactions",
+        },
+    )
+    def do_ledger(app: MoneyApp, args):
+        response = Response(app)
+        if args.rebuild:
+            if not BalanceHelper.rebuild(app.database):
+                return response.on("error").message(
+                    "action", style="error", action="REBUILD", what="daily balances"
+                ).concat(AppHelper.get_database_errors(app))
+            response.message(
+                "action", style="success", action="REBUILD", what="daily balances"
+            )
+
+        mismatches = BalanceHelper.verify(app.database)
+        if not mismatches:
+            return response.message(
+                None,
+                "Daily balances match the saved transactions\n",
+                style="success",
+            )
+        return (
+            response.on("error")
+            .message(
+                "found",
+                style="error",
+                count=len(mismatches),
+                what="mismatched daily balances",
+                result="Use `--rebuild` to fix them",
+            )
+            .table(mismatches, style="bordered")
+        )
+
+    @as_command(
+        description="Show the balance of one or all wallets at a point of time",
+        epilog="The balance starts from the nearest saved liquidity (by `check` command) before the timestamp and adds the transactions happened after it",
+        arguments={
+            "wallet": "w (str): wallet to get the balance. All wallets by default",
+            "timestamp": "t, at (datetime): timestamp to get the balance. Now by default",
+            "currency": "c (str): currency unit",
+        },
+    )
+    def do_balance(app: MoneyApp, args):
+        response = Response(app)
+        timestamp = (args.timestamp or datetime.now()).replace(microsecond=0)
+        if args.wallet:
+            wallet = AppHelper.get_record_by_name_or_id(
+                app.database[TABLE_WALLET.name], args.wallet
+            )
+            if not wallet:
+                return response.on("error").message(
+                    "found",
+                    style="error",
+                    negative=True,
+                    what=TABLE_WALLET.human_name(),
+                    field="alias",
+                    items=args.wallet,
+                )
+            wallets = [wallet]
+        else:
+            wallets = app.database.query(
+                f"SELECT {COLUMN_ID}, name FROM {TABLE_WALLET.name} "
+                + f"WHERE {COLUMN_DELETE} IS NULL ORDER BY {COLUMN_ID}"
+            )
+
+        checkpoints_by_wallet = {}
+        for checkpoint in AppHelper.get_liquidity_checkpoints(
+            app,
+            timestamp,
+            wallet_id=wallets[0][COLUMN_ID] if args.wallet else None,
+            currency=args.currency,
+        ):
+            checkpoints_by_wallet.setdefault(checkpoint["wallet"], []).append(
+                checkpoint
+            )
+
+        rows = []
+        for wallet in wallets:
+            balances = AppHelper.get_wallet_balance_at(
+                app,
+                wallet[COLUMN_ID],
+                timestamp,
+                currency=args.currency,
+                checkpoints=checkpoints_by_wallet.get(wallet[COLUMN_ID], []),
+            )
+            for currency, balance in sorted(balances.items()):
+                rows.append(
+                    {
+                        "wallet": wallet["name"],
+                        "currency": currency,
+                        "balance": f"{balance['balance']:,.0f}",
+                        "checkpoint": balance["checkpoint"] or "",
+                        "checkpoint balance": (
+                            ""
+                            if balance["checkpoint_balance"] is None
+                            else f"{balance['checkpoint_balance']:,.0f}"
+                        ),
+                    }
+                )
+
+        response.message(
+            None, f"Balance at [{show_datetime(timestamp)}]:", style="info"
+        )
+        if not rows:
+            return response.message(
+                "found", style="info", negative=True, what="balances"
+            )
+        return response.table(rows, style="bordered")
+
+    @as_command(
+        description="Recalculate the balances of all saved liquidities from transactions",
+        epilog="The calculated balance of a liquidity is saved when it is created, so it turns stale when older transactions are added or changed later. This command recalculates it for every liquidity in timestamp order and shows the ones that drift from the saved value",
+        arguments={
+            "wallet": "w (str): only audit liquidities of the wallet",
+            "fix": "(bool = 0): save the recalculated balances into database",
+        },
+    )
+    def do_audit(app: MoneyApp, args):
+        response = Response(app)
+        wallet_id = None
+        if args.wallet:
+            wallet = AppHelper.get_record_by_name_or_id(
+                app.database[TABLE_WALLET.name], args.wallet
+            )
+            if not wallet:
+                return response.on("error").message(
+                    "found",
+                    style="error",
+                    negative=True,
+                    what=TABLE_WALLET.human_name(),
+                    field="alias",
+                    items=args.wallet,
+                )
+            wallet_id = wallet[COLUMN_ID]
+        try:
+            liquidities = AppHelper.audit_liquidities(app, wallet_id)
+        except Exception as error:
+            return response.on("error").message(
+                "exception", style="error", message=error
+            )
+
+        drifts = [
+            liquidity
+            for liquidity in liquidities
+            if liquidity["calculate"] is None
+            or abs(liquidity["expected"] - liquidity["calculate"]) > 1e-6
+        ]
+        response.message(
+            "found",
+            style="info",
+            count=len(drifts),
+            total=len(liquidities),
+            what=TABLE_LIQUIDITY.human_name(len(liquidities)),
+            result="with calculated balances different from transactions",
+        )
+        if not drifts:
+            return response
+        wallets = app.database.query(f"SELECT {COLUMN_ID}, name FROM {TABLE_WALLET.name}")
+        wallet_names = {wallet[COLUMN_ID]: wallet["name"] for wallet in wallets}
+        response.table(
+            [
+                {
+                    COLUMN_ID: liquidity[COLUMN_ID],
+                    "wallet": wallet_names.get(liquidity["wallet"], liquidity["wallet"]),
+                    "currency": liquidity["currency"],
+                    "timestamp": liquidity["timestamp"],
+                    "balance": f"{liquidity['balance']:,.0f}",
+                    "saved calculate": (
+                        ""
+                        if liquidity["calculate"] is None
+                        else f"{liquidity['calculate']:,.0f}"
+                    ),
+                    "calculate": f"{liquidity['expected']:,.0f}",
+                    "drift": f"{liquidity['expected'] - (liquidity['calculate'] or 0):,.0f}",
+                }
+                for liquidity in drifts
+            ],
+            style="bordered",
+        )
+        if not args.fix:
+            return response
+
+        calculations = {
+            liquidity[COLUMN_ID]: float(liquidity["expected"]) for liquidity in drifts
+        }
+        if not AppHelper.update_liquidity_calculations(app, calculations):
+            return response.on("error").message(
+                "action",
+                style="error",
+                action="UPDATE",
+                what=TABLE_LIQUIDITY.human_name(len(drifts)),
+            ).concat(AppHelper.get_database_errors(app))
+        return response.message(
+            "action",
+            style="success",
+            action="UPDATE",
+            what=TABLE_LIQUIDITY.human_name(len(drifts)),
+            argument="count",
+            value=len(drifts),
+        )
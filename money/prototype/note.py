@@ -1,6 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from cmdapp.core import Prototype, Response, as_command
 from cmdapp.parser import COLUMN_ID
-from cmdapp.utils import Hash
 
 from ..constants.var import *
 from ..constants.schema import *
@@ -14,15 +15,28 @@ class NotePrototype(Prototype):
         description="Import transactions from a note resource",
         epilog="\n".join(
             [
-                "By default, last imported record from note resource will be saved, regardless of importing outcome.",
-                "It is used as a mark to not import duplicated records",
+                "By default, a content hash of every note read from note resource will be saved, in the same database transaction as its records when the note is imported. A note that fails to be saved is read again on the next importing.",
+                "It is used to skip notes that were read before, so duplicated records are not imported",
+                "Local CSV and JSON Lines files are read from the position where the last importing stopped, unless they were rewritten",
                 "Use `--force` to ignore this check on importing",
+                "With many resources, remote notes are fetched concurrently while notes are saved one resource at a time",
+                "With `--workers`, local CSV and JSON Lines files are cut into byte ranges that other processes read and parse, other notes are read here and parsed by other processes by chunks. Notes are saved by this process in the reading order",
+                "With `--watch`, saved local CSV and JSON Lines resources are polled and their appended notes are imported until interrupted (Ctrl+C), a summary is written after each import. `--force` is ignored",
             ]
         ),
         arguments={
-            "resource": "r (str): reference a saved resource by id or name",
+            "resource": "[resources] r (array[str]): reference one or many saved resources by id or name",
+            "all": "a (bool = 0): import from all saved resources",
+            "jobs": "j (int = 4): number of remote resources fetched and decrypted concurrently",
             "force": "f (bool = 0): force to import all notes from resource and by pass all duplicating checks",
             "reserved": "s, save (str = .): folder to store notes that are not imported successfully (due to errors)",
+            "chunk": "k, batch (int = 500): number of notes read, parsed and saved (within one database transaction) at a time",
+            "quiet": "q (bool = 0): do not print the notes that are about to be imported",
+            "strict": "(bool = 0): fail the notes with unknown wallet, tag or account names, instead of importing them without those references",
+            "watch": "(bool = 0): keep running and import the notes appended to local resources",
+            "interval": "(float = 2): seconds between two checks of the watched files",
+            "debounce": "(float = 1): seconds without writes before a changed file is imported",
+            "workers": "w (int = 0): number of processes parsing notes in parallel, for very large files. By default, notes are parsed by this process",
         }
         | {
             k: TABLE_RESOURCE[k].metadata | {"required": False}
@@ -31,125 +45,78 @@ class NotePrototype(Prototype):
     )
     def do_import(app: MoneyApp, args):
         response = Response(app)
-        if not (args.resource or args.link):
+        if not (args.resource or args.link or args.all):
             return response.on("error").message(
                 "action",
                 style="error",
                 action="IMPORT",
                 what="notes",
-                reason="missing both 'resource' and 'link'",
-            )
-        # get configuration for importing: link, currency, scale,...
-        if args.resource:
-            metadata = AppHelper.get_record_by_name_or_id(
-                app.database[TABLE_RESOURCE.name], args.resource
+                reason="missing 'resource', 'link' and 'all'",
             )
-            if not metadata:
+        if not (args.resource or args.all):
+            if args.watch:
                 return response.on("error").message(
-                    "found",
-                    style="error",
-                    negative=True,
-                    what=TABLE_RESOURCE.human_name(),
-                    field="alias",
-                    items=args.resource,
+                    "argument",
+                    argument="watch",
+                    status="invalid",
+                    reason="only saved resources can be watched",
                 )
+            return NoteHelper.import_notes(app, args, {})
+        # get configuration for importing: link, currency, scale,...
+        if args.all:
+            resources = NoteHelper.get_resources(app)
         else:
-            metadata = {}
-        resource_link, note_scope, last_import_record, options = Hash.get(
-            metadata,
-            link=args.link,
-            scope=args.scope,
-            last_record=None,
-            option=None,
-        )
-        options = (options or {}) | dict(args.option or {})
-
-        # get new notes
-        try:
-            new_data = NoteHelper.parse_from_url(
-                resource_link,
-                None if args.force else last_import_record,
-                options.get("format"),
-            )
-        except Exception as err:
-            return response.message("exception", message=err, argument=resource_link)
-        count = len(new_data)
-        if not count:
+            resources = []
+            for alias in args.resource:
+                metadata = AppHelper.get_record_by_name_or_id(
+                    app.database[TABLE_RESOURCE.name], alias
+                )
+                if not metadata:
+                    response.on("error").message(
+                        "found",
+                        style="error",
+                        negative=True,
+                        what=TABLE_RESOURCE.human_name(),
+                        field="alias",
+                        items=alias,
+                    )
+                else:
+                    resources.append(metadata)
+        if not resources:
             return response.message(
-                "found", style="info", negative=True, what="new notes"
-            )
-
-        # save last record to note resource database
-        if args.resource:
-            response.concat(
-                NoteHelper.update_last_record(app, metadata[COLUMN_ID], new_data[-1])
+                "found", style="info", negative=True, what=TABLE_RESOURCE.human_name()
             )
+        if args.watch:
+            return response.concat(NoteHelper.watch_resources(app, args, resources))
+        if len(resources) == 1:
+            return response.concat(NoteHelper.import_notes(app, args, resources[0]))
 
-        aliases = AppHelper.transaction_aliases(app)
-        field_to_name = app.config.get(CONFIG_NOTE_FIELDNAMES, default={})
-        # parse notes to get data to save
-        sanitized_data, error_with_indices = NoteHelper.parse_notes(
-            aliases,
-            new_data,
-            scope=note_scope,
-            options=options,
-            rename={v: k for k, v in field_to_name.items()},
-        )
-
-        # print invalid records
-        invalid_data = []
-        error_log_file = NoteHelper.get_error_log_file(args.reserved)
-        response.on("error")
-        for index, error in error_with_indices:
-            response.message(
-                "action",
-                style="error",
-                action="PARSE",
-                what="notes to transactions",
-                argument=f"notes[{index + 1}]",
-                value=new_data[index],
-                reason=error,
-            )
-            invalid_data.append(new_data[index] | {"error": str(error)})
-
-        count = len(sanitized_data)
-        # if no valid data, save errors to log or return due to no further processing
-        if not count:
-            return (
-                response.json(invalid_data, path=error_log_file)
-                if args.reserved
-                else response
-            )
-
-        # print valid record - which about to saved
-        response.on("output").message(
-            "found",
-            style="info",
-            count=count,
-            what="new notes",
-            result="Prepare to import following notes:",
-        )
-        response.json(sanitized_data, separator=" | ", indent=1, allow_unicode=True)
-
-        # save into database
-        error_indices = AppHelper.save_transactions_in_scope(app, sanitized_data)
-        message_kwargs = dict(action="IMPORT", what="notes")
-        if not error_indices:
-            response.on("output").message(
-                "action",
-                style="success",
-                result=f"{len(sanitized_data)} notes were saved",
-                **message_kwargs,
-            )
-        else:
-            response.on("error").message("action", style="error", **message_kwargs)
-            # save all invalid data: parse error, save error,...
-            if args.reserved:
-                invalid_data.extend(
-                    [
-                        sanitized_data[index] | {"error": "save error"}
-                        for index in error_indices
-                    ]
+        # fetch remote resources concurrently, notes are saved by this thread only
+        with NoteHelper.create_session(args.jobs) as session, ThreadPoolExecutor(
+            max_workers=max(args.jobs, 1)
+        ) as executor:
+            fetches = {}
+            for metadata in resources:
+                if NoteHelper.is_remote(metadata["link"]):
+                    future = executor.submit(
+                        NoteHelper.fetch_notes,
+                        metadata["link"],
+                        NoteHelper.get_import_options(metadata, args.option),
+                        session,
+                        not args.force,
+                    )
+                    fetches[metadata[COLUMN_ID]] = future.result
+            for metadata in resources:
+                response.on("output").message(
+                    "action",
+                    style="info",
+                    action="IMPORT",
+                    what="notes",
+                    scope=f"{TABLE_RESOURCE.human_name()} [{metadata['name']}]",
+                )
+                response.concat(
+                    NoteHelper.import_notes(
+                        app, args, metadata, fetches.get(metadata[COLUMN_ID])
+                    )
                 )
-                response.json(invalid_data, path=error_log_file)
-        return response.concat(AppHelper.get_database_errors(app))
+        return response
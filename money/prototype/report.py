@@ -3,12 +3,46 @@ from cmdapp.utils import Hash
 from cmdapp.parser import COLUMN_ID
 
 from ..constants.schema import *
-from ..constants.var import CONFIG_REPORT_FIELDNAMES
+from ..constants.var import CONFIG_REPORT_FIELDNAMES, EXPORT_PAGE_SIZE
 
-from ..helper import AppHelper, ReportHelper
+from ..helper import AppHelper, ReportHelper, ExportHelper
 from ..app import MoneyApp
 
 
+# only the requested page is read, so it shows up without waiting for the
+# whole result
+def list_transactions(app: MoneyApp, filters: dict, limit: int, page: int = 1):
+    response = Response(app)
+    page = max(page or 1, 1)
+    try:
+        pages = AppHelper.iterate_transaction_pages(
+            app, limit, offset=(page - 1) * limit, **filters
+        )
+        transactions = next(pages, [])
+    except Exception as error:
+        return response.on("error").message("exception", style="error", message=error)
+    if not transactions:
+        return response.message(
+            "found",
+            style="info",
+            negative=True,
+            what=TABLE_TRANSACTION.human_name(2),
+            inside=f"page {page}",
+        )
+    start = (page - 1) * limit + 1
+    end = start + len(transactions) - 1
+    response.message(
+        None,
+        f"{TABLE_TRANSACTION.human_name(2).upper()} {start} - {end} (page {page}):",
+        style="info",
+    ).table(transactions, style="bordered")
+    if len(transactions) == limit:
+        response.message(
+            None, f"Use `--page {page + 1}` to see the next page\n", style="info"
+        )
+    return response
+
+
 class ReportPrototype(Prototype):
     @as_command(
         description="Report for transactions filtered by some criteria",
@@ -23,9 +57,11 @@ class ReportPrototype(Prototype):
             "currencies": "c (list[str]): filter by one or many currencies",
             "name": "n (str[telex]): name (title) of the report. required for saving",
             "export": "[file] p (str): save transactions into invoice file",
-            "format": "f (str = html): export invoice file format",
+            "format": "f (str = html): export invoice file format.\n`csv` and `jsonl` files are written while the transactions are read, other formats like `html` are not streamed: they are rendered by the app formatter from all the transactions at once",
             "rename": "[name=new_name] q (json[telex]): rename invoice fields. The orders are important",
             "save": "(bool = 0): set to save report into database",
+            "limit": "l (int): list the transactions page by page with this number of transactions per page, instead of the report",
+            "page": "(int = 1): page of transactions to list with `--limit`",
         },
     )
     def do_report(app: MoneyApp, args):
@@ -44,7 +80,9 @@ class ReportPrototype(Prototype):
                     items=args.report,
                 )
             filters = report_attributes["filters"]
-            use_filters = dict(ids=report_attributes["txs"])
+            use_filters = dict(
+                id_ranges=ReportHelper.decode_id_ranges(report_attributes["txs"])
+            )
             report_name = report_attributes["name"]
         else:
             filters = Hash.filter(
@@ -56,13 +94,24 @@ class ReportPrototype(Prototype):
             )
             use_filters = filters
             report_name = args.name or ""
+        if args.limit:
+            return list_transactions(app, use_filters, args.limit, args.page)
+
+        # streamed exports read the transactions by themselves
+        need_rows = args.export and not ExportHelper.is_streamable(args.format)
         try:
-            transactions = AppHelper.filter_transactions(app, **use_filters)
+            if need_rows:
+                transactions = AppHelper.filter_transactions(app, **use_filters)
+            else:
+                aggregates = AppHelper.aggregate_transactions(app, **use_filters)
         except Exception as error:
             return response.on("error").message(
                 "exception", style="error", message=error
             )
-        count = len(transactions)
+        if need_rows:
+            count = len(transactions)
+        else:
+            count = sum(group["count"] for group in aggregates)
         response.message(
             "found", style="info", count=count, what=TABLE_TRANSACTION.human_name(count)
         )
@@ -73,9 +122,14 @@ class ReportPrototype(Prototype):
         response.message(
             None, f"{report_name.upper()}\n{report_description}\n", style="info"
         )
-        report_data = ReportHelper.report_by_categories(
-            transactions, bool(args.wallets), bool(args.relates)
-        )
+        if need_rows:
+            report_data = ReportHelper.report_by_categories(
+                transactions, bool(args.wallets), bool(args.relates)
+            )
+        else:
+            report_data = ReportHelper.report_by_aggregates(
+                aggregates, bool(args.wallets), bool(args.relates)
+            )
         response.table(report_data)
 
         # create new report
@@ -89,10 +143,14 @@ class ReportPrototype(Prototype):
                     result="Abort saving report",
                 )
             else:
+                if need_rows:
+                    ids = [tx[COLUMN_ID] for tx in transactions]
+                else:
+                    ids = AppHelper.filter_transaction_ids(app, **use_filters)
                 report_attributes = {
                     "name": report_name,
                     "filters": filters,
-                    "txs": [tx[COLUMN_ID] for tx in transactions],
+                    "txs": ReportHelper.encode_ids(ids),
                     "data": report_data,
                 }
                 response.concat(
@@ -104,15 +162,23 @@ class ReportPrototype(Prototype):
             return response
 
         fieldnames = app.config.get(CONFIG_REPORT_FIELDNAMES) or dict(args.rename or {})
+        export_options = dict(
+            title=report_name,
+            description=report_description,
+            rename=fieldnames,
+            what="invoices",
+        )
+        if not need_rows:
+            transactions = AppHelper.iterate_transactions(
+                app, EXPORT_PAGE_SIZE, **use_filters
+            )
+            return response.concat(
+                ExportHelper.export_rows(
+                    app, transactions, args.export, args.format, **export_options
+                )
+            )
         return response.concat(
             AppHelper.export_to_file(
-                app,
-                transactions,
-                args.export,
-                args.format,
-                title=report_name,
-                description=report_description,
-                rename=fieldnames,
-                what="invoices",
+                app, transactions, args.export, args.format, **export_options
             )
         )
@@ -0,0 +1,110 @@
+import contextlib
+import io
+import os
+import socket
+import socketserver
+import traceback
+
+from .app import MoneyApp
+from .constants.var import ENV_SOCKET_PATH, DEFAULT_SOCKET_PATH
+
+SOCKET_PATH = os.environ.get(ENV_SOCKET_PATH, DEFAULT_SOCKET_PATH)
+# the end of a command line sent by the client
+COMMAND_END = b"\n"
+
+
+class ClientWriter(io.RawIOBase):
+    # a client may disconnect before the command ends, the rest of the output is
+    # dropped so the command is not stopped halfway
+    def __init__(self, file):
+        self.file = file
+        self.disconnected = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if not self.disconnected:
+            try:
+                self.file.write(data)
+            except OSError:
+                self.disconnected = True
+        return len(data)
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    # run one command line like the interactive loop does, everything the command
+    # prints is sent back to the client while it is written
+    def handle(self):
+        line = self.rfile.readline().decode("utf-8").strip()
+        if not line:
+            return
+        app: MoneyApp = self.server.app
+        output = io.TextIOWrapper(
+            ClientWriter(self.wfile),
+            encoding="utf-8",
+            line_buffering=True,
+            write_through=True,
+        )
+        stdout = app.stdout
+        app.stdout = output
+        try:
+            with contextlib.redirect_stdout(output):
+                line = app.precmd(line)
+                app.postcmd(app.onecmd(line), line)
+        except Exception:
+            output.write(traceback.format_exc())
+        finally:
+            app.stdout = stdout
+            output.flush()
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    def __init__(self, app: MoneyApp, path: str):
+        self.app = app
+        super().__init__(path, CommandHandler)
+
+
+def is_listening(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+            return True
+        except OSError:
+            return False
+
+
+# commands are run one at a time by the same app, so the database connection,
+# its page cache and the in-memory caches stay warm between commands
+def serve(app: MoneyApp, path: str = SOCKET_PATH):
+    def write(message: str):
+        app.stdout.write(message + "\n")
+        app.stdout.flush()
+
+    if not hasattr(socket, "AF_UNIX"):
+        write("Unix domain sockets are not supported on this platform")
+        return
+    if os.path.exists(path):
+        if is_listening(path):
+            write(f"Another app is listening at [{os.path.abspath(path)}]")
+            return
+        os.remove(path)
+    # anyone connecting can run any command, so only the current user can connect
+    umask = os.umask(0o177)
+    try:
+        server = CommandServer(app, path)
+    finally:
+        os.umask(umask)
+    write(f"Listening at [{os.path.abspath(path)}], press Ctrl+C to stop")
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.remove(path)
+
+
+class MoneyServerApp(MoneyApp):
+    def cmdloop(self, intro=None):
+        serve(self)
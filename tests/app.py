@@ -0,0 +1,56 @@
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+from unittest import mock
+
+HAS_CMDAPP = importlib.util.find_spec("cmdapp") is not None
+
+
+# the app of `main`, with a database and config in `directory`
+def create_app(directory: str):
+    from cmdapp.base import BasePrototype
+    from cmdapp.core import start_app
+
+    from money.app import MoneyApp
+    from money.constants.template import RESPONSE_FORMATTER
+    from money.main import prepare_database
+    from money.prototype import NotePrototype
+
+    # the app is taken when its loop would start
+    class CreatedApp(MoneyApp):
+        def cmdloop(self, intro=None):
+            CreatedApp.app = self
+
+    database, good = prepare_database(os.path.join(directory, "money.db"))
+    if not good:
+        raise RuntimeError(database.get_errors())
+    with mock.patch.object(sys, "argv", ["money"]):
+        start_app(
+            app_prototypes=[
+                BasePrototype(database, category="Database Commands"),
+                NotePrototype(category="Expense Commands"),
+            ],
+            app_class=CreatedApp,
+            builtin_command_category="Builtin Commands",
+            app_name="Money",
+            database=database,
+            response_formatter=RESPONSE_FORMATTER,
+            config_path=os.path.join(directory, "money.conf"),
+        )
+    return CreatedApp.app
+
+
+# run a command line like the interactive loop does and return its output
+def run_command(app, line: str) -> str:
+    output = io.StringIO()
+    stdout = app.stdout
+    app.stdout = output
+    try:
+        with contextlib.redirect_stdout(output):
+            line = app.precmd(line)
+            app.postcmd(app.onecmd(line), line)
+    finally:
+        app.stdout = stdout
+    return output.getvalue()
@@ -0,0 +1,78 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_page(rows: list[tuple[str, str]]) -> str:
+    cells = "".join(
+        f"<tr><td>{amount}</td><td>{message}</td></tr>" for amount, message in rows
+    )
+    return (
+        "<html><body><table><tr><th>amount</th><th>message</th></tr>"
+        + cells
+        + "</table></body></html>"
+    )
+
+
+class MonographServer(ThreadingHTTPServer):
+    # serves the pages by path with an ETag, and answers 304 to conditional
+    # requests of unchanged pages
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MonographHandler)
+        self.pages: dict[str, str] = {}
+        self.versions: dict[str, int] = {}
+        self.requests: list[tuple[str, dict]] = []
+        self.lock = threading.Lock()
+        # seconds to answer, so concurrent requests overlap
+        self.delay = 0
+        self.active, self.max_active = 0, 0
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def set_page(self, path: str, page: str):
+        with self.lock:
+            self.pages[path] = page
+            self.versions[path] = self.versions.get(path, 0) + 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class MonographHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server: MonographServer = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+            page = server.pages.get(self.path)
+            etag = f'"{server.versions.get(self.path)}"'
+        if page is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,52 @@
+import unittest
+
+from .app import HAS_CMDAPP
+
+
+class RecordDatabase:
+    def __init__(self, records: dict[str, list[str]]):
+        self.records = records
+
+    def query(self, sql: str, params=None) -> list[dict]:
+        table_name = sql.split(" FROM ")[1].split()[0]
+        names = self.records.get(table_name, [])
+        return [dict(id=index, name=name) for index, name in enumerate(names, 1)]
+
+
+@unittest.skipUnless(HAS_CMDAPP, "cmdapp is not installed")
+class AliasMapTest(unittest.TestCase):
+    def create_aliases(self, strict: bool = False):
+        from money.helper.alias import AliasMap
+
+        database = RecordDatabase({"account": ["An", "Bình"], "tag": ["food"]})
+        return AliasMap(database, ["account", "tag"], strict=strict)
+
+    def test_unknown_names_are_left_out_of_list(self):
+        aliases = self.create_aliases()
+
+        self.assertEqual(aliases.resolve("account", ["An", "Ghost", "binh"]), [1, 2])
+        self.assertEqual(aliases.resolve("account", "Ghost"), None)
+        self.assertEqual(aliases.unknown["account"], {"Ghost": 2})
+
+    def test_strict_unknown_name_fails(self):
+        from money.helper.alias import UnknownAliasError
+
+        aliases = self.create_aliases(strict=True)
+
+        with self.assertRaises(UnknownAliasError):
+            aliases.resolve("account", ["An", "Ghost"])
+
+    def test_unknown_people_are_left_out_with_their_shares(self):
+        from money.helper.note import NoteHelper
+
+        aliases = self.create_aliases()
+        note = {"shares": "An:2, Ghost:3, Bình:4", "tag": "food"}
+
+        sharing = NoteHelper.sanitize_sharing(aliases, note)
+
+        self.assertEqual(sharing["people"], [1, 2])
+        self.assertEqual(sharing["shares"], [2.0, 4.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
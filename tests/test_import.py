@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from .app import HAS_CMDAPP, create_app, run_command
+from .monograph import MonographServer, make_page
+
+
+@unittest.skipUnless(HAS_CMDAPP, "cmdapp is not installed")
+class ImportAllTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.app = create_app(self.directory)
+        self.app.database["account"].insert(dict(name="me"))
+        self.app.database["wallet"].insert(dict(name="cash", account=1))
+
+        self.server = MonographServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.server.delay = 0.2
+        self.server.set_page("/a", make_page([("1000", "coffee"), ("2000", "tea")]))
+        self.server.set_page("/c", make_page([("3000", "cake")]))
+        for name in ["a", "b", "c"]:
+            self.app.database["resource"].insert(
+                dict(
+                    name=name,
+                    link=self.server.url(f"/{name}"),
+                    option={"format": "notesnook", "payer": "cash"},
+                )
+            )
+
+    def get_last_records(self) -> dict:
+        resources = self.app.database.query("SELECT name, last_record FROM resource")
+        return {resource["name"]: resource["last_record"] for resource in resources}
+
+    def test_failed_resource_does_not_stop_others(self):
+        output = run_command(self.app, f"import --all -j 3 -s {self.directory}")
+
+        messages = self.app.database.query("SELECT message FROM tx ORDER BY amount")
+        self.assertEqual(
+            [message["message"] for message in messages], ["coffee", "tea", "cake"]
+        )
+        self.assertIn("Fail to get Notesnook note", output)
+        last_records = self.get_last_records()
+        self.assertIsNotNone(last_records["a"])
+        self.assertIsNone(last_records["b"])
+        self.assertIsNotNone(last_records["c"])
+
+    def test_resources_are_fetched_concurrently(self):
+        run_command(self.app, f"import --all -j 3 -s {self.directory}")
+
+        paths = sorted(path for path, _ in self.server.requests)
+        self.assertEqual(paths, ["/a", "/b", "/c"])
+        self.assertGreater(self.server.max_active, 1)
+
+    def test_saved_notes_are_not_imported_again(self):
+        run_command(self.app, f"import --all -j 3 -s {self.directory}")
+        self.server.set_page("/c", make_page([("3000", "cake"), ("4000", "pie")]))
+
+        run_command(self.app, f"import --all -j 3 -s {self.directory}")
+
+        count = self.app.database.query("SELECT count(*) AS count FROM tx")
+        self.assertEqual(count[0]["count"], 4)
+
+
+@unittest.skipUnless(HAS_CMDAPP, "cmdapp is not installed")
+class ParallelImportTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.app = create_app(self.directory)
+        self.app.database["account"].insert(dict(name="me"))
+        self.app.database["wallet"].insert(dict(name="cash", account=1))
+
+    def test_workers_read_ranges_of_local_file(self):
+        notes = [("abc" if i == 3 else str(i * 1000), f"note {i}") for i in range(30)]
+        path = f"{self.directory}/notes.csv"
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write("amount,message,payer\n")
+            file.writelines(f"{amount},{message},cash\n" for amount, message in notes)
+
+        # several ranges for each process
+        with mock.patch("money.helper.note.WORKER_RANGE_SIZE", 64):
+            output = run_command(self.app, f"import -l {path} -w 2 -s {self.directory}")
+
+        messages = self.app.database.query("SELECT message FROM tx ORDER BY id")
+        self.assertEqual(
+            [message["message"] for message in messages],
+            [message for amount, message in notes if amount != "abc"],
+        )
+        self.assertIn("notes[4]", output)
+
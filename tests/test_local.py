@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from money.notes import LocalParser
+
+
+class IterateLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        return path
+
+    def test_offset_stops_before_unterminated_line(self):
+        path = self.write("notes.csv", "amount\n1\n2\n1000,coff")
+        position = {}
+
+        notes = list(LocalParser.iterate(path, None, position))
+
+        self.assertEqual([note["amount"] for note in notes], ["1", "2"])
+        self.assertEqual(position["offset"], len("amount\n1\n2\n"))
+
+    def test_unterminated_line_is_read_without_position(self):
+        path = self.write("notes.csv", "amount\n1\n2\n3")
+
+        notes = list(LocalParser.iterate(path))
+
+        self.assertEqual([note["amount"] for note in notes], ["1", "2", "3"])
+
+    def test_resume_reads_unterminated_line_once_complete(self):
+        path = self.write("notes.csv", "amount,message\n1,tea\n1000,coff")
+        position = {}
+        list(LocalParser.iterate(path, None, position))
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("ee\n2000,cake\n")
+
+        notes = list(LocalParser.iterate(path, None, position))
+
+        self.assertEqual(
+            notes,
+            [
+                {"amount": "1000", "message": "coffee"},
+                {"amount": "2000", "message": "cake"},
+            ],
+        )
+        self.assertEqual(position["offset"], os.path.getsize(path))
+
+    def test_resume_jsonl(self):
+        path = self.write("notes.jsonl", '{"amount": 1}\n{"amount": 2')
+        position = {}
+        self.assertEqual(
+            list(LocalParser.iterate(path, None, position)), [{"amount": 1}]
+        )
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('0}\n{"amount": 3}\n')
+
+        notes = list(LocalParser.iterate(path, None, position))
+
+        self.assertEqual(notes, [{"amount": 20}, {"amount": 3}])
+        self.assertEqual(position["offset"], os.path.getsize(path))
+
+class SplitRangesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        return path
+
+    def read_ranges(self, path: str, offset: int = 0) -> list[list[dict]]:
+        notes = []
+        for start, end in LocalParser.split_ranges(path, None, offset, 8):
+            position = {"offset": start}
+            notes.append(list(LocalParser.iterate(path, None, position, end)))
+            if end is not None:
+                self.assertEqual(position["offset"], end)
+        return notes
+
+    def test_ranges_read_every_note_once(self):
+        content = "amount,message\n" + "".join(f"{i},tea\n" for i in range(20))
+        path = self.write("notes.csv", content + "20,unterminated")
+
+        notes = sum(self.read_ranges(path), [])
+
+        amounts = [note["amount"] for note in notes]
+        self.assertEqual(amounts, [str(i) for i in range(20)])
+
+    def test_quoted_line_break_is_not_cut(self):
+        message = 'tea\n""hot""\ncake'
+        path = self.write("notes.csv", f'amount,message\n1,"{message}"\n2,pie\n')
+
+        notes = [notes for notes in self.read_ranges(path) if notes]
+
+        self.assertEqual(
+            notes,
+            [
+                [{"amount": "1", "message": 'tea\n"hot"\ncake'}],
+                [{"amount": "2", "message": "pie"}],
+            ],
+        )
+
+    def test_ranges_start_at_offset(self):
+        lines = [f'{{"amount": {i}}}\n' for i in range(9)]
+        path = self.write("notes.jsonl", "".join(lines))
+        offset = len("".join(lines[:6]))
+
+        notes = self.read_ranges(path, offset)
+
+        self.assertGreater(len(notes), 1)
+        self.assertEqual(sum(notes, []), [{"amount": 6}, {"amount": 7}, {"amount": 8}])
+
+
+class IterateJsonArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        # values and separators are split across reads
+        patcher = mock.patch("money.notes.local.JSON_READ_SIZE", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def parse(self, content: str) -> list:
+        path = os.path.join(self.directory.name, "notes.json")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return LocalParser.parse(path)
+
+    def test_items_separated_by_commas(self):
+        notes = self.parse(' [ {"amount": 1000} ,\n 25 , "tea", [1, 2] ]\n ')
+
+        self.assertEqual(notes, [{"amount": 1000}, 25, "tea", [1, 2]])
+        self.assertEqual(self.parse("[ ]"), [])
+
+    def test_missing_comma_fails(self):
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse("[1 2]")
+
+    def test_repeated_comma_fails(self):
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse("[1,,2]")
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse("[1,]")
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse("[,1]")
+
+    def test_data_after_array_fails(self):
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse("[1, 2] [3]")
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse("[1, 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
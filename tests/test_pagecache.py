@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from money.notes import notesnook
+from money.notes.notesnook import NotesnookParser
+from money.notes.pagecache import PageCache
+
+from .monograph import MonographServer, make_page
+
+
+class ConditionalFetchTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = PageCache(directory.name)
+        patcher = mock.patch.object(notesnook, "PAGE_CACHE", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = MonographServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.server.set_page("/note", make_page([("1000", "coffee")]))
+        self.url = self.server.url("/note")
+
+    def parse(self, only_modified=True) -> list:
+        return NotesnookParser.parse(self.url, only_modified=only_modified)
+
+    def test_unchanged_page_has_no_new_notes(self):
+        self.assertEqual(self.parse(), [{"amount": "1000", "message": "coffee"}])
+        NotesnookParser.release_page(self.url, True)
+
+        self.assertEqual(self.parse(), [])
+        self.assertEqual(self.server.requests[-1][1].get("If-None-Match"), '"1"')
+
+    def test_unchanged_page_is_read_from_cache(self):
+        self.parse()
+        NotesnookParser.release_page(self.url, True)
+
+        notes = self.parse(only_modified=False)
+
+        self.assertEqual(notes, [{"amount": "1000", "message": "coffee"}])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_page_of_unsaved_notes_is_not_cached(self):
+        self.parse()
+        NotesnookParser.release_page(self.url, False)
+
+        self.assertEqual(self.parse(), [{"amount": "1000", "message": "coffee"}])
+        self.assertNotIn("If-None-Match", self.server.requests[-1][1])
+
+    def test_changed_page_is_fetched(self):
+        self.parse()
+        NotesnookParser.release_page(self.url, True)
+        self.server.set_page("/note", make_page([("2000", "tea")]))
+
+        self.assertEqual(self.parse(), [{"amount": "2000", "message": "tea"}])
+
+
+class EvictionTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_least_recently_used_page_is_evicted(self):
+        cache = PageCache(self.directory, max_size=400)
+        for index, url in enumerate(["http://a", "http://b"]):
+            cache.set(url, {"ETag": '"1"'}, "x" * 100)
+            os.utime(cache.get_paths(url)[0], (index, index))
+        cache.get_headers("http://a")
+
+        cache.set("http://c", {"ETag": '"1"'}, "x" * 100)
+
+        self.assertEqual(cache.get_body("http://b"), None)
+        self.assertEqual(cache.get_body("http://a"), "x" * 100)
+        self.assertEqual(cache.get_headers("http://c"), {"If-None-Match": '"1"'})
+
+    def test_evicted_page_has_no_headers(self):
+        cache = PageCache(self.directory)
+        cache.set("http://a", {"ETag": '"1"'}, "page")
+        with mock.patch.object(os, "utime", side_effect=FileNotFoundError):
+            self.assertEqual(cache.get_headers("http://a"), {})
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from .app import HAS_CMDAPP
+
+
+@unittest.skipUnless(HAS_CMDAPP, "cmdapp is not installed")
+class CreateTriggersTest(unittest.TestCase):
+    def setUp(self):
+        from money.main import prepare_database
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database, good = prepare_database(
+            os.path.join(directory.name, "money.db")
+        )
+        self.assertTrue(good)
+
+    def create_trigger(self, name: str) -> bool:
+        from money.constants.schema import TABLE_ACCOUNT
+        from money.helper.schema import SchemaHelper
+
+        trigger = dict(
+            name="trg_account_rename",
+            event="AFTER INSERT",
+            table=TABLE_ACCOUNT,
+            statements=[f"UPDATE account SET name = '{name}' WHERE id = new.id"],
+        )
+        return SchemaHelper.create_triggers(self.database, [trigger])
+
+    def test_changed_definition_replaces_old_trigger(self):
+        self.assertTrue(self.create_trigger("old"))
+        self.assertTrue(self.create_trigger("new"))
+
+        self.database["account"].insert(dict(name="me"))
+
+        accounts = self.database.query("SELECT name FROM account")
+        self.assertEqual([account["name"] for account in accounts], ["new"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+from .app import HAS_CMDAPP, create_app
+
+
+@unittest.skipUnless(HAS_CMDAPP, "cmdapp is not installed")
+class CommandHandlerTest(unittest.TestCase):
+    def setUp(self):
+        from money.server import CommandServer
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.app = create_app(self.directory)
+        self.app.database["account"].insert(dict(name="me"))
+        self.app.database["wallet"].insert(dict(name="cash", account=1))
+        self.path = os.path.join(self.directory, "money.sock")
+        self.server = CommandServer(self.app, self.path)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def count_transactions(self) -> int:
+        return self.app.database.query("SELECT count(*) AS count FROM tx")[0]["count"]
+
+    def write_notes(self) -> str:
+        path = os.path.join(self.directory, "notes.csv")
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write("amount,message,payer\n1000,coffee,cash\n2000,tea,cash\n")
+        return path
+
+    def send(self, line: str) -> str:
+        from money.client import send_command
+
+        output = io.BytesIO()
+        send_command(line, self.path, output)
+        return output.getvalue().decode("utf-8")
+
+    def test_command_output_is_sent_to_client(self):
+        stdout, app_stdout = sys.stdout, self.app.stdout
+        line = f"import -l {self.write_notes()} -s {self.directory}"
+
+        output = self.send(line)
+
+        self.assertIn("coffee", output)
+        self.assertIn("2 notes were saved", output)
+        self.assertEqual(self.count_transactions(), 2)
+        self.assertIs(sys.stdout, stdout)
+        self.assertIs(self.app.stdout, app_stdout)
+
+    def test_disconnected_client_does_not_stop_command(self):
+        from money.server import CommandHandler
+
+        request, client = socket.socketpair()
+        line = f"import -l {self.write_notes()} -s {self.directory}\n"
+        client.sendall(line.encode("utf-8"))
+        client.close()
+
+        CommandHandler(request, "", self.server)
+        request.close()
+
+        self.assertEqual(self.count_transactions(), 2)
+        self.assertIn("help", self.send("help"))
@@ -0,0 +1,49 @@
+import unittest
+
+from money.notes.table import TABLE_READ_SIZE, iterate_tables
+
+
+def make_table(rows: list[tuple[str, str]], padding: int = 0) -> str:
+    cells = "".join(
+        f"<tr><td>{amount}</td><td>{message}</td></tr>" for amount, message in rows
+    )
+    return (
+        f"<html><body><p>{'x' * padding}</p><table>"
+        + "<tr><th>amount</th><th>message</th></tr>"
+        + cells
+        + "</table></body></html>"
+    )
+
+
+class IterateTablesTest(unittest.TestCase):
+    def test_cell_across_read_boundary(self):
+        head = make_table([])
+        head = head[: head.index("</table>")]
+        # the amount starts two characters before the end of the first slice
+        padding = TABLE_READ_SIZE - len(head) - len("<tr><td>") - 2
+        text = make_table([("3206", "lunch with friends")], padding)
+        self.assertEqual(text.index("3206"), TABLE_READ_SIZE - 2)
+
+        rows = list(iterate_tables(text))
+
+        self.assertEqual(rows, [{"amount": "3206", "message": "lunch with friends"}])
+
+    def test_large_table(self):
+        rows = [(str(index * 7), f"note {index} of the day") for index in range(5000)]
+
+        result = list(iterate_tables(make_table(rows)))
+
+        self.assertEqual(
+            result, [{"amount": amount, "message": message} for amount, message in rows]
+        )
+
+    def test_elements_in_cell(self):
+        text = make_table([("<b>12</b> 000", "<p>coffee</p><p>cake</p>")])
+
+        rows = list(iterate_tables(text))
+
+        self.assertEqual(rows, [{"amount": "12\n000", "message": "coffee\ncake"}])
+
+
+if __name__ == "__main__":
+    unittest.main()